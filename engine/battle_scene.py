@@ -76,10 +76,14 @@ class BattleScene:
         enemies: List[Enemy],
         font: pygame.font.Font,
         companions: Optional[List[object]] = None,
+        rng: Optional[random.Random] = None,
     ) -> None:
         self.player = player
         self.font = font
 
+        # Turn order + enemy AI rolls (the run's "battle" stream when given)
+        self.rng = rng or random.Random()
+
         # Grid configuration (battlefield, not dungeon grid)
         # Wider battlefield; origin is centered dynamically in draw().
         self.grid_width = 11
@@ -356,7 +360,7 @@ class BattleScene:
 
         # Turn state
         self.turn_order: List[BattleUnit] = self.player_units + self.enemy_units
-        random.shuffle(self.turn_order)
+        self.rng.shuffle(self.turn_order)
         self.turn_index: int = 0
         self.turn: Side = self.turn_order[0].side if self.turn_order else "player"
         self.status: BattleStatus = "ongoing"
@@ -787,7 +791,7 @@ class BattleScene:
             for skill in unit.skills.values():
                 if skill.target_mode == "self":
                     cd = unit.cooldowns.get(skill.id, 0)
-                    if cd == 0 and random.random() < 0.5:
+                    if cd == 0 and self.rng.random() < 0.5:
                         if self._use_skill(unit, skill, for_ai=True):
                             # _use_skill already advanced the turn
                             return
@@ -803,7 +807,7 @@ class BattleScene:
             for s in unit.skills.values()
             if s.target_mode == "adjacent_enemy" and s.base_power > 0.0
         ]
-        random.shuffle(offensive_skills)
+        self.rng.shuffle(offensive_skills)
 
         any_adjacent = bool(self._enemies_in_range(unit, 1))
 
@@ -814,7 +818,7 @@ class BattleScene:
                 continue
 
             cd = unit.cooldowns.get(skill.id, 0)
-            if cd == 0 and random.random() < 0.4:
+            if cd == 0 and self.rng.random() < 0.4:
                 if self._use_skill(unit, skill, for_ai=True):
                     # _use_skill handles logging, damage, win checks, and _next_turn()
                     return
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
-import random
 
 import pygame
 
@@ -9,7 +8,7 @@ from settings import TILE_SIZE
 from world.entities import Enemy, Chest
 from world.entities import EventNode  # NEW
 from world.entities import Merchant  # NEW merchant NPC
-from world.ai import update_enemy_ai  # NEW: centralised enemy AI
+from world.ai import AIScheduler  # centralised enemy AI (LOD tiers + think budget)
 from systems.inventory import get_item_def
 from systems.loot import roll_chest_loot, get_shop_stock_for_floor
 from systems.events import get_event_def, EventResult  # NEW
@@ -32,6 +31,7 @@ class ExplorationController:
 
     def __init__(self, game: "Game") -> None:
         self.game = game
+        self.ai_scheduler = AIScheduler()
 
     # ---------------------------------------------------------------------
     # Public API used by Game
@@ -152,22 +152,23 @@ class ExplorationController:
 
             blocked_by_tiles = not game.current_map.rect_can_move_to(new_rect)
 
+            # Only entities overlapping the destination rect matter
+            touching = game.current_map.entities_in_rect(new_rect)
+
             # Enemies block movement; stepping into them triggers battle instead
             blocking_enemies: list[Enemy] = [
                 e
-                for e in game.current_map.entities
+                for e in touching
                 if isinstance(e, Enemy)
                 and getattr(e, "blocks_movement", True)
-                and e.rect.colliderect(new_rect)
             ]
 
             # Merchants also block movement, but do NOT start battles
             blocking_merchants: list[Merchant] = [
                 m
-                for m in game.current_map.entities
+                for m in touching
                 if isinstance(m, Merchant)
                 and getattr(m, "blocks_movement", True)
-                and m.rect.colliderect(new_rect)
             ]
 
             if not blocked_by_tiles and not blocking_enemies and not blocking_merchants:
@@ -181,9 +182,7 @@ class ExplorationController:
                 pass
 
         # --- Enemy updates (delegated to world.ai) ---
-        for entity in list(game.current_map.entities):
-            if isinstance(entity, Enemy):
-                update_enemy_ai(entity, game, dt)
+        self.ai_scheduler.update(game, dt)
 
     # ---------------------------------------------------------------------
     # Internal helpers
@@ -360,18 +359,7 @@ class ExplorationController:
             return None
 
         px, py = game.player.rect.center
-        max_dist_sq = max_distance_px * max_distance_px
-
-        for entity in getattr(game.current_map, "entities", []):
-            if not isinstance(entity, Chest):
-                continue
-            cx, cy = entity.rect.center
-            dx = cx - px
-            dy = cy - py
-            if dx * dx + dy * dy <= max_dist_sq:
-                return entity
-
-        return None
+        return game.current_map.nearest_entity(px, py, max_distance_px, kind=Chest)
 
     def find_chest_near_player(self, max_distance_px: int) -> Optional[Chest]:
         """
@@ -408,13 +396,14 @@ class ExplorationController:
         chest.opened = True
 
         # Roll item loot first
-        item_id = roll_chest_loot(game.floor)
+        loot_rng = game.rng.stream("loot")
+        item_id = roll_chest_loot(game.floor, rng=loot_rng)
 
         # Roll some gold for the chest as well
         # Floors deeper → more gold
         min_gold = 5 + game.floor
         max_gold = 10 + game.floor * 2
-        gold_amount = random.randint(min_gold, max_gold)
+        gold_amount = loot_rng.randint(min_gold, max_gold)
         gained_gold = 0
         if hasattr(game.hero_stats, "add_gold"):
             gained_gold = game.hero_stats.add_gold(gold_amount)
@@ -459,19 +448,7 @@ class ExplorationController:
             return None
 
         px, py = game.player.rect.center
-        max_dist_sq = max_distance_px * max_distance_px
-
-        for entity in getattr(game.current_map, "entities", []):
-            from world.entities import EventNode  # type: ignore
-            if not isinstance(entity, EventNode):
-                continue
-            ex, ey = entity.rect.center
-            dx = ex - px
-            dy = ey - py
-            if dx * dx + dy * dy <= max_dist_sq:
-                return entity
-
-        return None
+        return game.current_map.nearest_entity(px, py, max_distance_px, kind=EventNode)
 
     def find_event_near_player(self, max_distance_px: int) -> Optional["EventNode"]:
         """
@@ -505,10 +482,7 @@ class ExplorationController:
 
         # Consume the node: remove from the map
         if game.current_map is not None:
-            try:
-                game.current_map.entities.remove(node)
-            except ValueError:
-                pass
+            game.current_map.remove_entity(node)
 
     # --- Merchant helpers ------------------------------------------------
 
@@ -525,18 +499,7 @@ class ExplorationController:
             return None
 
         px, py = game.player.rect.center
-        max_dist_sq = max_distance_px * max_distance_px
-
-        for entity in getattr(game.current_map, "entities", []):
-            if not isinstance(entity, Merchant):
-                continue
-            mx, my = entity.rect.center
-            dx = mx - px
-            dy = my - py
-            if dx * dx + dy * dy <= max_dist_sq:
-                return entity
-
-        return None
+        return game.current_map.nearest_entity(px, py, max_distance_px, kind=Merchant)
 
     def find_merchant_near_player(self, max_distance_px: int) -> Optional["Merchant"]:
         """
@@ -558,7 +521,9 @@ class ExplorationController:
             game.last_message = "You have nothing to trade with."
             return
 
-        stock = get_shop_stock_for_floor(game.floor)
+        stock = get_shop_stock_for_floor(
+            game.floor, rng=game.rng.floor(game.floor, "shop")
+        )
         if not stock:
             game.last_message = "No merchants are trading here right now."
             return
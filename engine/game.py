@@ -1,5 +1,5 @@
-import random
 import math
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from typing import Optional, List
 
 import pygame
@@ -7,6 +7,12 @@ import pygame
 from settings import COLOR_BG, TILE_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT
 from world.mapgen import generate_floor
 from world.game_map import GameMap
+from world.floor_snapshot import (
+    HOT_FLOOR_RADIUS,
+    FloorSnapshot,
+    restore_floor,
+    snapshot_floor,
+)
 from world.entities import Player, Enemy, Merchant
 from .battle_scene import BattleScene
 from .exploration import ExplorationController
@@ -23,6 +29,7 @@ from systems.party import (
 from systems import perks as perk_system
 from systems.inventory import Inventory, get_item_def
 from systems.loot import roll_battle_loot
+from systems.rng import RunRNG
 from systems.enemies import (
     choose_archetype_for_floor,
     compute_scaled_stats,
@@ -58,9 +65,18 @@ class Game:
     - "perk_choice": level-up perk choice overlay after a battle
     """
 
-    def __init__(self, screen: pygame.Surface, hero_class_id: str = "warrior") -> None:
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        hero_class_id: str = "warrior",
+        seed: Optional[int] = None,
+    ) -> None:
         self.screen = screen
 
+        # Run seed + derived random streams (floors, loot, perks, battle...).
+        # Pass ``seed`` to replay a run exactly; None picks a fresh one.
+        self.rng = RunRNG(seed)
+
         # Hero progression for this run (will be set in _init_hero_for_class)
         self.hero_stats = HeroStats()
 
@@ -78,8 +94,18 @@ class Game:
         self.current_map: Optional[GameMap] = None
         self.player: Optional[Player] = None
 
-        # Store generated floors so layouts/enemies persist
+        # Loaded floors (current + neighbours) so layouts/enemies persist,
+        # and compact snapshots of floors further away (rebuilt on demand
+        # from the run seed; see _evict_distant_floors).
         self.floors: dict[int, GameMap] = {}
+        self.floor_snapshots: dict[int, FloorSnapshot] = {}
+
+        # Build the next floor down in a worker thread while the player
+        # explores this one (see _prefetch_next_floor).
+        self.prefetch_floors: bool = True
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        # (floor index, run seed it was built for, pending GameMap)
+        self._prefetch: Optional[tuple[int, int, Future]] = None
 
         # Simple UI font
         self.ui_font = pygame.font.SysFont("consolas", 20)
@@ -741,19 +767,19 @@ class Game:
         return messages
 
     def update_fov(self) -> None:
-        """Recompute the map's FOV around the player."""
+        """
+        Refresh the map's FOV around the player.
+
+        Cheap to call every frame: GameMap caches the result per
+        (player tile, radius, map revision), so it only recomputes when the
+        player enters a new tile or the map changes.
+        """
         if self.current_map is None:
             return
 
-        # Debug: reveal entire map if enabled
+        # Debug: reveal entire map if enabled (cached on the map as well)
         if getattr(self, "debug_reveal_map", False):
-            all_coords = {
-                (x, y)
-                for y in range(self.current_map.height)
-                for x in range(self.current_map.width)
-            }
-            self.current_map.visible = set(all_coords)
-            self.current_map.explored = set(all_coords)
+            self.current_map.reveal_all()
             return
 
         if self.player is None:
@@ -838,6 +864,10 @@ class Game:
         # Update the game's screen reference
         self.screen = new_screen
 
+        # Cached map surfaces were converted to the old display format
+        for game_map in self.floors.values():
+            game_map.invalidate_render_cache()
+
         # Re-center / clamp camera to fit the new viewport
         self._center_camera_on_player()
         self._clamp_camera_to_map()
@@ -849,7 +879,8 @@ class Game:
 
     def load_floor(self, floor_index: int, from_direction: Optional[str]) -> None:
         """
-        Load a floor, generating it if needed.
+        Load a floor, generating it if needed (or rebuilding it from its
+        snapshot if it was evicted).
 
         from_direction:
             None   -> starting game / default
@@ -861,35 +892,20 @@ class Game:
 
         # Try to reuse an existing GameMap instance for this floor
         game_map = self.floors.get(floor_index)
-        newly_created = False
 
         if game_map is None:
-            # Generate raw tiles + stair positions + high-level rooms
-            tiles, up_tx, up_ty, down_tx, down_ty, rooms = generate_floor(floor_index)
-
-            # Wrap them in a GameMap object
-            game_map = GameMap(
-                tiles,
-                up_stairs=(up_tx, up_ty),
-                down_stairs=(down_tx, down_ty),
-                entities=None,
-                rooms=rooms,
-            )
+            game_map = self._take_prefetched_floor(floor_index)
+            if game_map is None:
+                game_map = self._build_floor(floor_index)
+            snapshot = self.floor_snapshots.pop(floor_index, None)
+            if snapshot is not None:
+                restore_floor(game_map, snapshot)
             self.floors[floor_index] = game_map
-            newly_created = True
 
         # From now on self.current_map is a GameMap, not a tuple
         self.current_map = game_map
-
-        # Spawn enemies / events / chests / merchants only once per floor
-        if newly_created:
-            self.spawn_enemies_for_floor(game_map, floor_index)
-            self.spawn_events_for_floor(game_map, floor_index)
-            self.spawn_chests_for_floor(game_map, floor_index)
-            self.spawn_merchants_for_floor(game_map, floor_index)
-
-            # Debug/testing: always ensure at least one merchant on floor 3
-            self._ensure_debug_merchant_on_floor_three(game_map, floor_index)
+        self._evict_distant_floors(floor_index)
+        self._prefetch_next_floor(floor_index + 1)
 
         # Decide spawn position based on stair direction
         if from_direction == "down" and game_map.up_stairs is not None:
@@ -944,6 +960,111 @@ class Game:
         # Initial FOV on this floor (centered on player spawn)
         self.update_fov()
 
+    def _build_floor(self, floor_index: int) -> GameMap:
+        """
+        Generate a floor's layout and spawns. Everything is drawn from the
+        floor's seeded streams, so the result only depends on (run seed,
+        floor index) and an evicted floor can be rebuilt identically.
+        """
+        # Generate raw tiles + stair positions + high-level rooms
+        layout = generate_floor(floor_index, rng=self.rng.floor(floor_index, "mapgen"))
+
+        # Wrap them in a GameMap object
+        game_map = GameMap(
+            layout.tiles,
+            up_stairs=layout.up_stairs,
+            down_stairs=layout.down_stairs,
+            entities=None,
+            rooms=layout.rooms,
+        )
+
+        # Spawn enemies / events / chests / merchants
+        self.spawn_enemies_for_floor(game_map, floor_index)
+        self.spawn_events_for_floor(game_map, floor_index)
+        self.spawn_chests_for_floor(game_map, floor_index)
+        self.spawn_merchants_for_floor(game_map, floor_index)
+
+        # Debug/testing: always ensure at least one merchant on floor 3
+        self._ensure_debug_merchant_on_floor_three(game_map, floor_index)
+
+        game_map.spawn_count = len(game_map.entities)
+        return game_map
+
+    def _prefetch_next_floor(self, floor_index: int) -> None:
+        """
+        Start building ``floor_index`` in the background, unless it's
+        already loaded or being built.
+
+        _build_floor only touches the new GameMap and the floor's own
+        seeded streams, so it's safe to run off the main thread; the map
+        isn't visible to the game until load_floor takes it.
+
+        The worker is an ordinary thread, so it shares the GIL with the main
+        loop: building a mega floor in the background still costs frame
+        time, it's just spread over the frames before the stairs are taken.
+        """
+        if not self.prefetch_floors or floor_index in self.floors:
+            return
+        if self._prefetch is not None:
+            pending_index, pending_seed, _ = self._prefetch
+            if pending_index == floor_index and pending_seed == self.rng.seed:
+                return
+            self._cancel_prefetch()
+
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="floor-prefetch"
+            )
+        future = self._prefetch_executor.submit(self._build_floor, floor_index)
+        self._prefetch = (floor_index, self.rng.seed, future)
+
+    def _take_prefetched_floor(self, floor_index: int) -> Optional[GameMap]:
+        """
+        Hand over a prefetched floor, or None if there isn't one for
+        ``floor_index`` in this run (the caller then builds it itself).
+
+        If the build is still running we wait for it (it's further along
+        than starting over); if it hasn't started yet, was cancelled or
+        failed, the caller builds it synchronously instead.
+        """
+        if self._prefetch is None:
+            return None
+        pending_index, pending_seed, future = self._prefetch
+        if pending_index != floor_index or pending_seed != self.rng.seed:
+            return None
+
+        self._prefetch = None
+        if future.cancel():
+            return None
+        try:
+            return future.result()
+        except (CancelledError, Exception):
+            return None
+
+    def _cancel_prefetch(self) -> None:
+        """Drop any pending prefetch (a running build finishes unused)."""
+        if self._prefetch is not None:
+            self._prefetch[2].cancel()
+            self._prefetch = None
+
+    def shutdown(self) -> None:
+        """Release background resources on quit (the floor prefetch thread)."""
+        self._prefetch = None
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = None
+
+    def _evict_distant_floors(self, floor_index: int) -> None:
+        """
+        Compact loaded floors more than HOT_FLOOR_RADIUS away from
+        ``floor_index`` into snapshots, so memory doesn't grow with depth.
+        """
+        for index in list(self.floors):
+            if abs(index - floor_index) <= HOT_FLOOR_RADIUS:
+                continue
+            game_map = self.floors.pop(index)
+            self.floor_snapshots[index] = snapshot_floor(index, game_map)
+
     def try_change_floor(self, delta: int) -> None:
         """
         Attempt to change floors via stairs up/down based on delta:
@@ -986,20 +1107,6 @@ class Game:
         self.load_floor(self.floor, from_direction=direction)
         self.last_message = f"You travel to floor {self.floor}."
 
-    def _choose_enemy_type_for_floor(self, floor_index: int) -> str:
-        """
-        Very simple enemy naming based on floor depth.
-        Used only for the battle UI group label.
-        """
-        if floor_index <= 2:
-            pool = ["Goblin", "Bandit", "Cultist"]
-        elif floor_index <= 4:
-            pool = ["Ghoul", "Orc Raider", "Dark Acolyte"]
-        else:
-            pool = ["Dread Knight", "Voidspawn", "Elite Cultist"]
-
-        return random.choice(pool)
-
     def spawn_enemies_for_floor(self, game_map: GameMap, floor_index: int) -> None:
         """
         Spawn enemies on this floor, using room-aware logic, enemy archetypes,
@@ -1011,6 +1118,8 @@ class Game:
         - Fill remaining quota from other rooms and corridors.
         - Keep a safe radius around the main spawn.
         """
+        rng = self.rng.floor(floor_index, "enemies")
+
         enemy_width = 24
         enemy_height = 24
 
@@ -1029,48 +1138,40 @@ class Game:
         room_tiles: List[tuple[int, int]] = []
         corridor_tiles: List[tuple[int, int]] = []
 
-        for ty in range(game_map.height):
-            for tx in range(game_map.width):
-                if not game_map.is_walkable_tile(tx, ty):
-                    continue
-                if up is not None and (tx, ty) == up:
-                    continue
-                if down is not None and (tx, ty) == down:
-                    continue
-
-                # Keep a small safe bubble around spawn
-                dx = tx - safe_cx
-                dy = ty - safe_cy
-                if dx * dx + dy * dy <= safe_radius_tiles * safe_radius_tiles:
-                    continue
+        def is_candidate(tile: tuple[int, int]) -> bool:
+            if tile == up or tile == down:
+                return False
+            # Keep a small safe bubble around spawn
+            dx = tile[0] - safe_cx
+            dy = tile[1] - safe_cy
+            return dx * dx + dy * dy > safe_radius_tiles * safe_radius_tiles
+
+        # Per-room tile lists come from the map's room index
+        for room in game_map.rooms:
+            tag = getattr(room, "tag", "generic")
+            if tag == "start":
+                # Extra safety: don't spawn in the start room at all
+                continue
+            bucket = lair_tiles if tag == "lair" else room_tiles
+            bucket.extend(filter(is_candidate, game_map.room_tiles(room)))
 
-                room = game_map.get_room_at(tx, ty) if hasattr(game_map, "get_room_at") else None
-                if room is None:
-                    # Corridors / junctions
-                    corridor_tiles.append((tx, ty))
-                else:
-                    tag = getattr(room, "tag", "generic")
-                    if tag == "start":
-                        # Extra safety: don't spawn in the start room at all
-                        continue
-                    elif tag == "lair":
-                        lair_tiles.append((tx, ty))
-                    else:
-                        room_tiles.append((tx, ty))
+        # Corridors / junctions
+        corridor_tiles.extend(filter(is_candidate, game_map.corridor_tiles()))
 
         if not (lair_tiles or room_tiles or corridor_tiles):
             return
 
-        random.shuffle(lair_tiles)
-        random.shuffle(room_tiles)
-        random.shuffle(corridor_tiles)
+        rng.shuffle(lair_tiles)
+        rng.shuffle(room_tiles)
+        rng.shuffle(corridor_tiles)
 
         # --- Decide roughly how many enemies we want on this floor ---------
         base_desired = 2 + floor_index
 
-        screen_w, screen_h = self.screen.get_size()
-        base_tiles_x = screen_w // TILE_SIZE
-        base_tiles_y = screen_h // TILE_SIZE
+        # Nominal window size (not the live screen) so a seed gives the
+        # same floor whatever the display resolution.
+        base_tiles_x = WINDOW_WIDTH // TILE_SIZE
+        base_tiles_y = WINDOW_HEIGHT // TILE_SIZE
         base_area = max(1, base_tiles_x * base_tiles_y)
 
         floor_area = game_map.width * game_map.height
@@ -1142,16 +1243,16 @@ class Game:
             if spawned_total >= max_total_enemies:
                 break
 
-            room = game_map.get_room_at(anchor_tx, anchor_ty) if hasattr(game_map, "get_room_at") else None
+            room = game_map.get_room_at(anchor_tx, anchor_ty)
             room_tag = getattr(room, "tag", "generic") if room is not None else None
 
             # --- Pick a pack template for this anchor ----------------------
             try:
-                pack = choose_pack_for_floor(floor_index, room_tag=room_tag)
+                pack = choose_pack_for_floor(floor_index, room_tag=room_tag, rng=rng)
                 member_arch_ids = list(pack.member_arch_ids)
             except Exception:
                 # Very defensive fallback: just pick a single archetype
-                arch = choose_archetype_for_floor(floor_index, room_tag=room_tag)
+                arch = choose_archetype_for_floor(floor_index, room_tag=room_tag, rng=rng)
                 member_arch_ids = [arch.id]
 
             # Candidate spawn tiles: anchor + its 8 neighbors (3×3 cluster)
@@ -1162,7 +1263,7 @@ class Game:
                     ty = anchor_ty + dy
                     if 0 <= tx < game_map.width and 0 <= ty < game_map.height:
                         candidate_tiles.append((tx, ty))
-            random.shuffle(candidate_tiles)
+            rng.shuffle(candidate_tiles)
 
             for arch_id in member_arch_ids:
                 if spawned_total >= max_total_enemies:
@@ -1184,7 +1285,7 @@ class Game:
                 try:
                     arch = get_archetype(arch_id)
                 except KeyError:
-                    arch = choose_archetype_for_floor(floor_index, room_tag=room_tag)
+                    arch = choose_archetype_for_floor(floor_index, room_tag=room_tag, rng=rng)
 
                 max_hp, attack_power, defense, xp_reward = compute_scaled_stats(arch, floor_index)
 
@@ -1194,26 +1295,23 @@ class Game:
                     y=ey,
                     width=enemy_width,
                     height=enemy_height,
+                    # Enemies block movement in exploration
+                    blocks_movement=True,
                     # Slightly slower chase speed for nicer exploration feel
                     speed=70.0,
+                    # Basic combat stats that BattleScene will use
+                    max_hp=max_hp,
+                    hp=max_hp,
+                    attack_power=attack_power,
+                    defense=defense,
+                    # XP reward and metadata
+                    xp_reward=xp_reward,
+                    enemy_type=arch.name,
+                    archetype_id=arch.id,
+                    ai_profile=arch.ai_profile,
                 )
 
-                # Basic combat stats that BattleScene will use
-                setattr(enemy, "max_hp", max_hp)
-                setattr(enemy, "hp", max_hp)
-                setattr(enemy, "attack_power", attack_power)
-                setattr(enemy, "defense", defense)
-
-                # XP reward and metadata
-                setattr(enemy, "xp_reward", xp_reward)
-                setattr(enemy, "enemy_type", arch.name)
-                setattr(enemy, "archetype_id", arch.id)
-                setattr(enemy, "ai_profile", arch.ai_profile)
-
-                # Enemies block movement in exploration
-                setattr(enemy, "blocks_movement", True)
-
-                game_map.entities.append(enemy)
+                game_map.add_entity(enemy)
                 occupied_enemy_tiles.add((spawn_tx, spawn_ty))
                 spawned_total += 1
 
@@ -1228,6 +1326,8 @@ class Game:
         """
         from world.entities import EventNode  # local to avoid circulars
 
+        rng = self.rng.floor(floor_index, "events")
+
         if not getattr(game_map, "rooms", None):
             return
 
@@ -1254,33 +1354,20 @@ class Game:
         event_room_tiles: list[tuple[int, int]] = []
         other_room_tiles: list[tuple[int, int]] = []
 
-        for ty in range(game_map.height):
-            for tx in range(game_map.width):
-                if not game_map.is_walkable_tile(tx, ty):
-                    continue
-                if up is not None and (tx, ty) == up:
-                    continue
-                if down is not None and (tx, ty) == down:
-                    continue
-                if (tx, ty) in occupied_tiles:
-                    continue
-
-                dx = tx - safe_cx
-                dy = ty - safe_cy
-                if dx * dx + dy * dy <= safe_radius_tiles * safe_radius_tiles:
-                    continue
-
-                room = game_map.get_room_at(tx, ty)
-                if room is None:
-                    continue  # no corridor events for now
-
-                tag = getattr(room, "tag", "generic")
-                if tag == "start":
-                    continue
-                if tag == "event":
-                    event_room_tiles.append((tx, ty))
-                else:
-                    other_room_tiles.append((tx, ty))
+        def is_candidate(tile: tuple[int, int]) -> bool:
+            if tile == up or tile == down or tile in occupied_tiles:
+                return False
+            dx = tile[0] - safe_cx
+            dy = tile[1] - safe_cy
+            return dx * dx + dy * dy > safe_radius_tiles * safe_radius_tiles
+
+        # Room tiles only: no corridor events for now
+        for room in game_map.rooms:
+            tag = getattr(room, "tag", "generic")
+            if tag == "start":
+                continue
+            bucket = event_room_tiles if tag == "event" else other_room_tiles
+            bucket.extend(filter(is_candidate, game_map.room_tiles(room)))
 
         if not event_room_tiles and not other_room_tiles:
             return
@@ -1291,15 +1378,15 @@ class Game:
             return
 
         min_events = 1 if event_room_tiles else 0
-        event_count = random.randint(min_events, max_events)
+        event_count = rng.randint(min_events, max_events)
         if event_count <= 0:
             return
 
         chosen_tiles: list[tuple[int, int]] = []
         remaining = event_count
 
-        random.shuffle(event_room_tiles)
-        random.shuffle(other_room_tiles)
+        rng.shuffle(event_room_tiles)
+        rng.shuffle(other_room_tiles)
 
         # First event in an 'event' room if possible
         if event_room_tiles and remaining > 0:
@@ -1308,7 +1395,7 @@ class Game:
 
         # Remaining events in any room tiles
         pool = event_room_tiles + other_room_tiles
-        random.shuffle(pool)
+        rng.shuffle(pool)
         chosen_tiles.extend(pool[:remaining])
 
         # Choose which event types are available
@@ -1319,7 +1406,7 @@ class Game:
         half_tile = TILE_SIZE // 2
 
         for tx, ty in chosen_tiles:
-            event_id = random.choice(available_event_ids)
+            event_id = rng.choice(available_event_ids)
             ex, ey = game_map.center_entity_on_tile(tx, ty, half_tile, half_tile)
             node = EventNode(
                 x=ex,
@@ -1328,7 +1415,7 @@ class Game:
                 height=half_tile,
                 event_id=event_id,
             )
-            game_map.entities.append(node)
+            game_map.add_entity(node)
 
     def spawn_chests_for_floor(self, game_map: GameMap, floor_index: int) -> None:
         """
@@ -1341,6 +1428,8 @@ class Game:
         """
         from world.entities import Chest  # local import to avoid circular
 
+        rng = self.rng.floor(floor_index, "chests")
+
         chest_width = TILE_SIZE // 2
         chest_height = TILE_SIZE // 2
 
@@ -1367,46 +1456,36 @@ class Game:
         treasure_tiles: List[tuple[int, int]] = []
         other_tiles: List[tuple[int, int]] = []
 
-        for ty in range(game_map.height):
-            for tx in range(game_map.width):
-                if not game_map.is_walkable_tile(tx, ty):
-                    continue
-                if up is not None and (tx, ty) == up:
-                    continue
-                if down is not None and (tx, ty) == down:
-                    continue
-                if (tx, ty) in occupied_tiles:
-                    continue
-
-                dx = tx - safe_cx
-                dy = ty - safe_cy
-                if dx * dx + dy * dy <= safe_radius_tiles * safe_radius_tiles:
-                    continue
-
-                room = game_map.get_room_at(tx, ty) if hasattr(game_map, "get_room_at") else None
-                if room is not None:
-                    tag = getattr(room, "tag", "generic")
-                    if tag == "start":
-                        # No loot cluttering the start room
-                        continue
-                    if tag == "treasure":
-                        treasure_tiles.append((tx, ty))
-                        continue
+        def is_candidate(tile: tuple[int, int]) -> bool:
+            if tile == up or tile == down or tile in occupied_tiles:
+                return False
+            dx = tile[0] - safe_cx
+            dy = tile[1] - safe_cy
+            return dx * dx + dy * dy > safe_radius_tiles * safe_radius_tiles
+
+        for room in game_map.rooms:
+            tag = getattr(room, "tag", "generic")
+            if tag == "start":
+                # No loot cluttering the start room
+                continue
+            # Default bucket for generic rooms / corridors
+            bucket = treasure_tiles if tag == "treasure" else other_tiles
+            bucket.extend(filter(is_candidate, game_map.room_tiles(room)))
 
-                # Default bucket for generic rooms / corridors
-                other_tiles.append((tx, ty))
+        other_tiles.extend(filter(is_candidate, game_map.corridor_tiles()))
 
         if not treasure_tiles and not other_tiles:
             return
 
-        random.shuffle(treasure_tiles)
-        random.shuffle(other_tiles)
+        rng.shuffle(treasure_tiles)
+        rng.shuffle(other_tiles)
 
         # Scale chest count with floor size:
         # 0–2 on normal floors, up to 3 on big ones.
-        screen_w, screen_h = self.screen.get_size()
-        base_tiles_x = screen_w // TILE_SIZE
-        base_tiles_y = screen_h // TILE_SIZE
+        # Nominal window size (not the live screen) so a seed gives the
+        # same floor whatever the display resolution.
+        base_tiles_x = WINDOW_WIDTH // TILE_SIZE
+        base_tiles_y = WINDOW_HEIGHT // TILE_SIZE
         base_area = max(1, base_tiles_x * base_tiles_y)
 
         floor_area = game_map.width * game_map.height
@@ -1422,7 +1501,7 @@ class Game:
         # If we have treasure tiles, try for at least 1 chest (1..max_chests).
         # If not, 0..max_chests like before.
         min_chests = 1 if treasure_tiles else 0
-        chest_count = random.randint(min_chests, max_chests)
+        chest_count = rng.randint(min_chests, max_chests)
 
         if chest_count <= 0:
             return
@@ -1437,7 +1516,7 @@ class Game:
 
         # Remaining chests go into other tiles first, then spare treasure tiles
         pool: List[tuple[int, int]] = other_tiles + treasure_tiles[1:]
-        random.shuffle(pool)
+        rng.shuffle(pool)
 
         for tx, ty in pool:
             if remaining <= 0:
@@ -1450,7 +1529,7 @@ class Game:
             chest = Chest(x=x, y=y, width=chest_width, height=chest_height)
             # Chests do not block movement
             setattr(chest, "blocks_movement", False)
-            game_map.entities.append(chest)
+            game_map.add_entity(chest)
 
     def spawn_merchants_for_floor(self, game_map: GameMap, floor_index: int) -> None:
         """
@@ -1478,29 +1557,19 @@ class Game:
             tx, ty = game_map.world_to_tile(cx, cy)
             occupied_tiles.add((tx, ty))
 
-        # Collect all walkable tiles for each distinct shop room
+        # Collect all free walkable tiles for each distinct shop room
         room_tiles: dict[object, list[tuple[int, int]]] = {}
 
-        for ty in range(game_map.height):
-            for tx in range(game_map.width):
-                if not game_map.is_walkable_tile(tx, ty):
-                    continue
-                if up is not None and (tx, ty) == up:
-                    continue
-                if down is not None and (tx, ty) == down:
-                    continue
-                if (tx, ty) in occupied_tiles:
-                    continue
-
-                if not hasattr(game_map, "get_room_at"):
-                    continue
-                room = game_map.get_room_at(tx, ty)
-                if room is None:
-                    continue
-                if getattr(room, "tag", "") != "shop":
-                    continue
-
-                room_tiles.setdefault(room, []).append((tx, ty))
+        for room in game_map.rooms:
+            if getattr(room, "tag", "") != "shop":
+                continue
+            free_tiles = [
+                tile
+                for tile in game_map.room_tiles(room)
+                if tile != up and tile != down and tile not in occupied_tiles
+            ]
+            if free_tiles:
+                room_tiles[room] = free_tiles
 
         if not room_tiles:
             return
@@ -1544,7 +1613,7 @@ class Game:
             # Merchants block movement
             merchant.blocks_movement = True
 
-            game_map.entities.append(merchant)
+            game_map.add_entity(merchant)
             occupied_tiles.add((chosen_tx, chosen_ty))
 
     def _ensure_debug_merchant_on_floor_three(
@@ -1564,9 +1633,8 @@ class Game:
             return
 
         # If there's already at least one merchant, do nothing
-        for entity in getattr(game_map, "entities", []):
-            if isinstance(entity, Merchant):
-                return
+        if game_map.merchants:
+            return
 
         # Choose the down-stairs tile if possible; otherwise fall back
         if game_map.down_stairs is not None:
@@ -1593,7 +1661,7 @@ class Game:
         )
         merchant.blocks_movement = True
 
-        game_map.entities.append(merchant)
+        game_map.add_entity(merchant)
 
 
     # ------------------------------------------------------------------
@@ -1623,23 +1691,23 @@ class Game:
         group: List[Enemy] = []
 
         # Always include the enemy that triggered the battle
-        if enemy in self.current_map.entities:
+        if self.current_map.has_entity(enemy):
             group.append(enemy)
 
-        # Add other nearby enemies within a radius
+        # Add other nearby enemies within a radius, closest first
         radius = TILE_SIZE * 4
         px, py = self.player.rect.center
 
-        for entity in list(self.current_map.entities):
-            if not isinstance(entity, Enemy):
-                continue
+        nearby = self.current_map.entities_in_radius(px, py, radius, kind=Enemy)
+
+        def dist_sq(e: Enemy) -> int:
+            ex, ey = e.rect.center
+            return (ex - px) * (ex - px) + (ey - py) * (ey - py)
+
+        for entity in sorted(nearby, key=dist_sq):
             if entity is enemy:
                 continue
-            ex, ey = entity.rect.center
-            dx = ex - px
-            dy = ey - py
-            if dx * dx + dy * dy <= radius * radius:
-                group.append(entity)
+            group.append(entity)
 
         # Limit how many can join a single battle (for sanity)
         max_group_size = 3
@@ -1647,10 +1715,7 @@ class Game:
 
         # 2) Remove all encounter enemies from the map so they can't be re-used
         for e in encounter_enemies:
-            try:
-                self.current_map.entities.remove(e)
-            except ValueError:
-                pass
+            self.current_map.remove_entity(e)
 
         # 3) Remember XP for this encounter (sum of all enemies in the group)
         xp_total = 0
@@ -1669,6 +1734,7 @@ class Game:
             encounter_enemies,
             self.ui_font,
             companions=companions_for_battle,
+            rng=self.rng.stream("battle"),
         )
         self.enter_battle_mode()
 
@@ -1682,8 +1748,11 @@ class Game:
         # Remember current class (default to warrior if something went wrong)
         current_class = getattr(self.hero_stats, "hero_class_id", "warrior")
 
-        # Clear current run state
+        # Clear current run state (a new run gets a new seed)
+        self.rng = RunRNG()
         self.floors.clear()
+        self.floor_snapshots.clear()
+        self._cancel_prefetch()
         self.current_map = None
         self.player = None
         self.battle_scene = None
@@ -1725,7 +1794,7 @@ class Game:
         base_min_gold = 3 + self.floor
         base_max_gold = 6 + self.floor * 2
 
-        gold_amount = random.randint(base_min_gold, base_max_gold)
+        gold_amount = self.rng.stream("loot").randint(base_min_gold, base_max_gold)
         if hasattr(self.hero_stats, "add_gold"):
             gained_gold = self.hero_stats.add_gold(gold_amount)
         else:
@@ -1950,11 +2019,7 @@ class Game:
         )
 
         # Non-player entities (enemies, chests, props…) – only if visible
-        for entity in getattr(self.current_map, "entities", []):
-            cx, cy = entity.rect.center
-            tx, ty = self.current_map.world_to_tile(cx, cy)
-            if (tx, ty) not in self.current_map.visible:
-                continue
+        for entity in self.current_map.visible_entities():
             entity.draw(
                 self.screen,
                 camera_x=camera_x,
@@ -50,6 +50,7 @@ def main() -> None:
         game.draw()
         pygame.display.flip()
 
+    game.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -101,6 +101,7 @@ def _tier_for_floor(floor_index: int) -> int:
 def choose_archetype_for_floor(
     floor_index: int,
     room_tag: Optional[str] = None,
+    rng: Optional[random.Random] = None,
 ) -> EnemyArchetype:
     """
     Pick an archetype for the given floor + room tag.
@@ -132,12 +133,13 @@ def choose_archetype_for_floor(
 
         weights.append(w)
 
-    return random.choices(candidates, weights=weights, k=1)[0]
+    return (rng or random).choices(candidates, weights=weights, k=1)[0]
 
 
 def choose_pack_for_floor(
     floor_index: int,
     room_tag: Optional[str] = None,
+    rng: Optional[random.Random] = None,
 ) -> EnemyPackTemplate:
     """
     Pick a *pack template* for the given floor + room tag.
@@ -154,7 +156,7 @@ def choose_pack_for_floor(
 
     if not candidates:
         # Fallback: single-archetype pseudo-pack based on the floor.
-        arch = choose_archetype_for_floor(floor_index, room_tag=room_tag)
+        arch = choose_archetype_for_floor(floor_index, room_tag=room_tag, rng=rng)
         return EnemyPackTemplate(
             id=f"_single_{arch.id}",
             name=arch.name,
@@ -171,7 +173,7 @@ def choose_pack_for_floor(
             w += 1.0
         weights.append(w)
 
-    return random.choices(candidates, weights=weights, k=1)[0]
+    return (rng or random).choices(candidates, weights=weights, k=1)[0]
 
 
 # ---------------------------------------------------------------------------
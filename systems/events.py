@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass
 from typing import Callable, Dict, Optional
 
@@ -55,10 +54,11 @@ def shrine_of_power_handler(game) -> EventResult:
     """
     Shrine: random buff – XP, gold, or a perk.
     """
-    roll = random.random()
+    rng = game.rng.stream("events")
+    roll = rng.random()
     # ~40% XP, ~40% gold, ~20% perk
     if roll < 0.4:
-        xp = random.randint(20, 50)
+        xp = rng.randint(20, 50)
         msg_list = game.gain_xp_from_event(xp)
         text = "You kneel and feel energy surge through you."
         if msg_list:
@@ -66,13 +66,15 @@ def shrine_of_power_handler(game) -> EventResult:
         return EventResult(text=text, xp_gain=xp)
 
     if roll < 0.8:
-        gold = random.randint(25, 80)
+        gold = rng.randint(25, 80)
         gained = game.hero_stats.add_gold(gold)
         text = f"The shrine radiates golden light. You gain {gained} gold."
         return EventResult(text=text, gold_gain=gained)
 
     # Perk: pick 1 perk and auto-apply, similar to level-up
-    choices = perk_system.pick_perk_choices(game.hero_stats, max_choices=1)
+    choices = perk_system.pick_perk_choices(
+        game.hero_stats, max_choices=1, rng=game.rng.stream("perks")
+    )
     if choices:
         chosen = choices[0]
         chosen.apply(game.hero_stats)
@@ -93,13 +95,14 @@ def lore_stone_handler(game) -> EventResult:
     """
     Lore Stone: flavor text + small XP.
     """
+    rng = game.rng.stream("events")
     lore_lines = [
         "“In the Age of Ash, even light had a cost.”",
         "Ancient etchings hint at a kingdom swallowed by its own greed.",
         "You glimpse your reflection — older, crowned, and broken.",
     ]
-    msg = random.choice(lore_lines)
-    xp = random.randint(10, 20)
+    msg = rng.choice(lore_lines)
+    xp = rng.randint(10, 20)
     game.gain_xp_from_event(xp)
     return EventResult(text=msg, xp_gain=xp)
 
@@ -108,13 +111,14 @@ def risky_cache_handler(game) -> EventResult:
     """
     Risky Cache: gold vs small trap damage.
     """
-    if random.random() < 0.65:
-        gold = random.randint(30, 90)
+    rng = game.rng.stream("events")
+    if rng.random() < 0.65:
+        gold = rng.randint(30, 90)
         gained = game.hero_stats.add_gold(gold)
         text = f"You open the cache and find {gained} gold!"
         return EventResult(text=text, gold_gain=gained)
 
-    dmg = random.randint(5, 15)
+    dmg = rng.randint(5, 15)
     if game.player is not None:
         game.player.hp = max(0, game.player.hp - dmg)
     text = f"A gas trap! You cough violently and lose {dmg} HP."
@@ -56,14 +56,18 @@ def _candidate_items() -> List[ItemDef]:
     return candidates
 
 
-def _weighted_choice(items: List[ItemDef], weights: List[float]) -> Optional[ItemDef]:
+def _weighted_choice(
+    items: List[ItemDef],
+    weights: List[float],
+    rng: Optional[random.Random] = None,
+) -> Optional[ItemDef]:
     if not items:
         return None
     if len(items) == 1:
         return items[0]
 
     # random.choices is fine here, we only pick a single item.
-    chosen = random.choices(items, weights=weights, k=1)[0]
+    chosen = (rng or random).choices(items, weights=weights, k=1)[0]
     return chosen
 
 
@@ -93,7 +97,7 @@ def chest_drop_chance(floor_index: int) -> float:
 
 # ----------------- Public API -----------------
 
-def roll_battle_loot(floor_index: int) -> Optional[str]:
+def roll_battle_loot(floor_index: int, rng: Optional[random.Random] = None) -> Optional[str]:
     """
     Roll for loot from a normal battle.
 
@@ -101,7 +105,8 @@ def roll_battle_loot(floor_index: int) -> Optional[str]:
         item_id (str) if something drops, or None if no loot this time.
     """
     # First: decide if anything drops at all
-    if random.random() > battle_drop_chance(floor_index):
+    rng = rng or random
+    if rng.random() > battle_drop_chance(floor_index):
         return None
 
     items = _candidate_items()
@@ -112,11 +117,11 @@ def roll_battle_loot(floor_index: int) -> Optional[str]:
     for it in items:
         weights.append(_rarity_weight(it.rarity, floor_index, source="battle"))
 
-    chosen = _weighted_choice(items, weights)
+    chosen = _weighted_choice(items, weights, rng)
     return chosen.id if chosen is not None else None
 
 
-def roll_chest_loot(floor_index: int) -> Optional[str]:
+def roll_chest_loot(floor_index: int, rng: Optional[random.Random] = None) -> Optional[str]:
     """
     Roll for loot from a chest.
 
@@ -124,7 +129,8 @@ def roll_chest_loot(floor_index: int) -> Optional[str]:
         item_id (str) if the chest has something, or None for an empty chest.
     """
     # First: does this chest contain loot at all?
-    if random.random() > chest_drop_chance(floor_index):
+    rng = rng or random
+    if rng.random() > chest_drop_chance(floor_index):
         return None
 
     items = _candidate_items()
@@ -135,11 +141,15 @@ def roll_chest_loot(floor_index: int) -> Optional[str]:
     for it in items:
         weights.append(_rarity_weight(it.rarity, floor_index, source="chest"))
 
-    chosen = _weighted_choice(items, weights)
+    chosen = _weighted_choice(items, weights, rng)
     return chosen.id if chosen is not None else None
 
 
-def get_shop_stock_for_floor(floor_index: int, max_items: int = 6) -> List[str]:
+def get_shop_stock_for_floor(
+    floor_index: int,
+    max_items: int = 6,
+    rng: Optional[random.Random] = None,
+) -> List[str]:
     """
     Build a list of item_ids that a merchant on this floor offers.
 
@@ -168,7 +178,7 @@ def get_shop_stock_for_floor(floor_index: int, max_items: int = 6) -> List[str]:
 
     # We want unique items, so we sample without replacement using the weights.
     while weighted_pool and len(chosen_ids) < max_items:
-        chosen = _weighted_choice(weighted_pool, weights)
+        chosen = _weighted_choice(weighted_pool, weights, rng)
         if chosen is None:
             break
         chosen_ids.append(chosen.id)
@@ -339,7 +339,11 @@ def auto_assign_perks(hero_stats: object) -> List[str]:
     return messages
 
 
-def pick_perk_choices(hero_stats: object, max_choices: int = 3) -> List[Perk]:
+def pick_perk_choices(
+    hero_stats: object,
+    max_choices: int = 3,
+    rng: Optional[random.Random] = None,
+) -> List[Perk]:
     """
     Pick up to `max_choices` perk OPTIONS for the player to choose from.
 
@@ -347,7 +351,9 @@ def pick_perk_choices(hero_stats: object, max_choices: int = 3) -> List[Perk]:
     - Only perks not already learned
     - Only perks whose prerequisites are already owned
     - Tries to offer different branches first (vitality/blade/ward/focus/mobility)
+    - ``rng`` (default: the global ``random`` module) drives the shuffles
     """
+    rng = rng or random
     if not hasattr(hero_stats, "perks"):
         hero_stats.perks = []
 
@@ -363,7 +369,7 @@ def pick_perk_choices(hero_stats: object, max_choices: int = 3) -> List[Perk]:
     if not candidates:
         return []
 
-    random.shuffle(candidates)
+    rng.shuffle(candidates)
 
     # Group by branch to encourage variety
     by_branch: Dict[str, List[Perk]] = {}
@@ -374,17 +380,17 @@ def pick_perk_choices(hero_stats: object, max_choices: int = 3) -> List[Perk]:
 
     # First pass: one perk per different branch
     branches = list(by_branch.keys())
-    random.shuffle(branches)
+    rng.shuffle(branches)
     for br in branches:
         if len(choices) >= max_choices:
             break
-        choice = random.choice(by_branch[br])
+        choice = rng.choice(by_branch[br])
         choices.append(choice)
 
     # Second pass: if still below max_choices, fill from remaining
     if len(choices) < max_choices:
         remaining = [p for p in candidates if p not in choices]
-        random.shuffle(remaining)
+        rng.shuffle(remaining)
         for p in remaining:
             if len(choices) >= max_choices:
                 break
@@ -208,15 +208,8 @@ def draw_exploration_ui(game: "Game") -> None:
                 room_hint = "A quiet merchant has set up here – find them and press E to trade."
 
         # Count nearby enemies for ambient info
-        nearby = 0
         radius_tiles = 7
-        radius_sq = (TILE_SIZE * radius_tiles) ** 2
-        for entity in getattr(game_map, "entities", []):
-            if isinstance(entity, Enemy):
-                dx = entity.rect.centerx - cx
-                dy = entity.rect.centery - cy
-                if dx * dx + dy * dy <= radius_sq:
-                    nearby += 1
+        nearby = len(game_map.entities_in_radius(cx, cy, TILE_SIZE * radius_tiles, kind=Enemy))
 
         if nearby > 0:
             if nearby == 1:
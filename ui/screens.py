@@ -74,7 +74,9 @@ class PerkChoiceScreen:
             owner, companion_index = queue.pop(0)
 
             if owner == "hero":
-                choices = perk_system.pick_perk_choices(game.hero_stats, max_choices=3)
+                choices = perk_system.pick_perk_choices(
+                    game.hero_stats, max_choices=3, rng=game.rng.stream("perks")
+                )
                 target_label = "Hero"
 
             elif (
@@ -85,7 +87,9 @@ class PerkChoiceScreen:
                 comp_state = game.party[companion_index]
 
                 # Use the same perk system but operating on the companion state.
-                choices = perk_system.pick_perk_choices(comp_state, max_choices=3)
+                choices = perk_system.pick_perk_choices(
+                    comp_state, max_choices=3, rng=game.rng.stream("perks")
+                )
 
                 # Try to build a friendly label for the overlay.
                 display_name = getattr(comp_state, "name_override", None)
@@ -2,22 +2,33 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional
 import random
 import math
+import time
 
+import numpy as np
 import pygame
 
 from settings import TILE_SIZE
 from world.entities import Enemy
+from world.entity_store import AI_STATE_CODES, KIND_ENEMY
+from world.path_service import PATH_FOUND, PATH_UNREACHABLE
 
 if TYPE_CHECKING:
     from engine.game import Game
     from world.entities import Enemy
 
 
+# (target_x, target_y, speed_factor, allow_battle) for one movement step
+MoveIntent = Tuple[float, float, float, bool]
+
 # Tunables for enemy awareness/behaviour
 DETECTION_RANGE_TILES = 9          # how far they can *see* you
+# "fov": look enemies up in one symmetric visibility field cast from the
+#        player (per player tile), O(1) per enemy.
+# "los": per-enemy Bresenham line-of-sight walk (the old behaviour).
+DETECTION_MODE = "fov"
 SEARCH_DURATION = 2.0              # seconds they keep searching after losing LoS
 STOP_SEARCH_DISTANCE_TILES = 0.5   # distance to last_seen to give up
 ALERT_RADIUS_TILES = 6           # how far an alerted shout travels to other enemies
@@ -28,27 +39,37 @@ PATROL_PAUSE_MIN = 0.5             # min idle pause at a patrol point
 PATROL_PAUSE_MAX = 2.0             # max idle pause at a patrol point
 PATROL_SPEED_FACTOR = 0.6          # patrol speed vs full chase speed
 
+# Level-of-detail tiers by distance to the player (chasing / searching
+# enemies always run at full rate):
+#   near    (<= AI_LOD_NEAR_TILES) : every frame
+#   far     (<= AI_WAKE_RADIUS_TILES): every AI_LOD_FAR_INTERVAL seconds,
+#                                     with the dt accumulated since
+#   dormant (beyond)               : not updated at all
+AI_LOD_NEAR_TILES = 16
+AI_WAKE_RADIUS_TILES = 40
+AI_LOD_FAR_INTERVAL = 0.25
+
+# Wall-clock budget per frame for enemy thinking (see AIScheduler)
+AI_THINK_BUDGET_MS = 2.0
 
-def _ensure_ai_fields(enemy: "Enemy") -> None:
+
+def _ensure_ai_fields(enemy: "Enemy", rng: Optional[random.Random] = None) -> None:
     """
-    Ensure this enemy has the AI attributes we expect.
-    We attach them dynamically so the Enemy class stays simple.
+    Finish initialising AI state that depends on the enemy's placement.
+    (The fields themselves are declared on Enemy.)
     """
-    if not hasattr(enemy, "ai_state"):
-        enemy.ai_state = "idle"  # "idle" | "chase" | "search"
-    if not hasattr(enemy, "ai_search_time"):
-        enemy.ai_search_time = 0.0
-    if not hasattr(enemy, "ai_last_seen_player_pos"):
-        enemy.ai_last_seen_player_pos: Optional[Tuple[float, float]] = None
-
-    # Patrol-related fields
-    if not hasattr(enemy, "ai_home_pos"):
+    if enemy.ai_home_pos is None:
         # Remember initial spawn as home
-        enemy.ai_home_pos: Tuple[float, float] = enemy.rect.center
-    if not hasattr(enemy, "ai_patrol_target"):
-        enemy.ai_patrol_target: Optional[Tuple[float, float]] = None
-    if not hasattr(enemy, "ai_patrol_pause"):
-        enemy.ai_patrol_pause: float = 0.0
+        enemy.ai_home_pos = enemy.rect.center
+        # Random phase so far-tier enemies don't all update on one frame
+        enemy.ai_lod_dt = (rng or random).uniform(0.0, AI_LOD_FAR_INTERVAL)
+
+
+def _set_ai_state(enemy: "Enemy", state: str) -> None:
+    """Change an enemy's AI state and mirror it into the map's entity store."""
+    enemy.ai_state = state
+    if enemy.entity_store is not None:
+        enemy.entity_store.refresh(enemy)
 
 
 def _move_enemy_towards(
@@ -87,24 +108,29 @@ def _move_enemy_towards(
         enemy.height,
     )
 
-    # Can't walk through walls
+    # Can't walk through walls; if the full move clips one, slide along it
+    # on whichever axis is still free (keeps enemies from snagging on
+    # corners while following a flow field).
     if not game.current_map.rect_can_move_to(new_rect):
-        return
+        for slide_x, slide_y in ((new_x, enemy.y), (enemy.x, new_y)):
+            slide_rect = pygame.Rect(int(slide_x), int(slide_y), enemy.width, enemy.height)
+            if (slide_x, slide_y) != (enemy.x, enemy.y) and game.current_map.rect_can_move_to(slide_rect):
+                new_x, new_y, new_rect = slide_x, slide_y, slide_rect
+                break
+        else:
+            return
 
     # Don't walk through other blocking entities
-    for entity in game.current_map.entities:
+    for entity in game.current_map.entities_in_rect(new_rect):
         if entity is enemy:
             continue
         if not getattr(entity, "blocks_movement", False):
             continue
-        if new_rect.colliderect(entity.rect):
-            return
+        return
 
     # If we're allowed to, colliding with the player can trigger battle
     if allow_battle and new_rect.colliderect(game.player.rect):
-        enemy.x = new_rect.x
-        enemy.y = new_rect.y
-        enemy.rect.topleft = (int(enemy.x), int(enemy.y))
+        enemy.move_to(new_rect.x, new_rect.y)
         if game.post_battle_grace <= 0.0:
             game.start_battle(enemy)
         return
@@ -113,13 +139,64 @@ def _move_enemy_towards(
     enemy.move_to(new_x, new_y)
 
 
-def _update_patrol(enemy: "Enemy", game: "Game", dt: float) -> None:
+def _route_towards(enemy: "Enemy", goal_x: float, goal_y: float, game: "Game") -> Tuple[float, float]:
     """
-    Idle behaviour: wander around a small radius from the home position.
+    Where the enemy should head next to reach a world-space goal.
+
+    Uses the map's shared flow field towards the goal tile, so enemies walk
+    around walls and through corridors instead of pushing straight at the
+    goal. Falls back to the goal itself once on the goal tile, or if it
+    can't be reached.
     """
-    if game.current_map is None:
-        return
+    current_map = game.current_map
+    goal_tx, goal_ty = current_map.world_to_tile(goal_x, goal_y)
+    ex, ey = enemy.rect.center
+    et_x, et_y = current_map.world_to_tile(ex, ey)
+
+    step = current_map.flow_field_to(goal_tx, goal_ty).next_step(et_x, et_y)
+    if step is None:
+        return goal_x, goal_y
+
+    sx, sy = step
+    return sx * TILE_SIZE + TILE_SIZE / 2, sy * TILE_SIZE + TILE_SIZE / 2
+
+
+def _path_waypoint(
+    enemy: "Enemy",
+    goal_x: float,
+    goal_y: float,
+    game: "Game",
+    *,
+    search: bool = True,
+) -> Tuple[str, Optional[Tuple[float, float]]]:
+    """
+    Next point to walk to on the A* path towards a world-space goal.
+
+    Returns (status, point) where status is a world.path_service PATH_*
+    value; point is None unless a path was found. On the goal tile the
+    point is the goal itself. ``search=False`` only looks at paths that
+    are already cached (used by the per-frame movement step).
+    """
+    current_map = game.current_map
+    ex, ey = enemy.rect.center
+    start = current_map.world_to_tile(ex, ey)
+    goal = current_map.world_to_tile(goal_x, goal_y)
+
+    status, step = current_map.paths.next_step(start, goal, search=search)
+    if status != PATH_FOUND:
+        return status, None
+    if step is None:
+        return status, (goal_x, goal_y)
+
+    sx, sy = step
+    return status, (sx * TILE_SIZE + TILE_SIZE / 2, sy * TILE_SIZE + TILE_SIZE / 2)
+
 
+def _think_patrol(enemy: "Enemy", game: "Game", dt: float) -> None:
+    """
+    Idle decisions: pause at patrol points, pick new ones around the home
+    position, and request the path to the current one.
+    """
     # If we're currently paused at a patrol point, count down
     if enemy.ai_patrol_pause > 0.0:
         enemy.ai_patrol_pause -= dt
@@ -141,25 +218,40 @@ def _update_patrol(enemy: "Enemy", game: "Game", dt: float) -> None:
         if dx * dx + dy * dy <= (0.3 * TILE_SIZE) ** 2:
             # Reached patrol point: pause for a bit, then choose a new one
             enemy.ai_patrol_target = None
-            enemy.ai_patrol_pause = random.uniform(PATROL_PAUSE_MIN, PATROL_PAUSE_MAX)
+            enemy.ai_patrol_pause = game.rng.stream("ai").uniform(PATROL_PAUSE_MIN, PATROL_PAUSE_MAX)
             return
 
-    # Move towards patrol target
+    # Request (or advance) the path; movement follows it once it's cached
+    status, _ = _path_waypoint(enemy, *enemy.ai_patrol_target, game)
+    if status == PATH_UNREACHABLE:
+        # Sampled a spot we can't get to (other side of a wall): pick again
+        enemy.ai_patrol_target = None
+
+
+def _patrol_move(enemy: "Enemy", game: "Game") -> Optional[MoveIntent]:
+    """Idle movement: next step on the cached path to the patrol target."""
+    if enemy.ai_patrol_pause > 0.0 or enemy.ai_patrol_target is None:
+        return None
+
     tx, ty = enemy.ai_patrol_target
-    _move_enemy_towards(
-        enemy,
-        tx,
-        ty,
-        game,
-        dt,
-        allow_battle=False,           # don't start battle just because you're strolling past
-        speed_factor=PATROL_SPEED_FACTOR,
-    )
+    dx = tx - enemy.rect.centerx
+    dy = ty - enemy.rect.centery
+    if dx * dx + dy * dy <= (0.3 * TILE_SIZE) ** 2:
+        return None  # arrived; the next think starts the pause
+
+    _, waypoint = _path_waypoint(enemy, tx, ty, game, search=False)
+    if waypoint is None:
+        return None  # no path cached yet
+
+    wx, wy = waypoint
+    # Don't start battle just because you're strolling past
+    return wx, wy, PATROL_SPEED_FACTOR, False
 
 
 def _choose_new_patrol_target(enemy: "Enemy", game: "Game") -> None:
     """
     Pick a random walkable tile within PATROL_RADIUS_TILES of the home position.
+    Reachability is checked by the path service once the enemy walks it.
     """
     if game.current_map is None:
         enemy.ai_patrol_target = None
@@ -168,9 +260,10 @@ def _choose_new_patrol_target(enemy: "Enemy", game: "Game") -> None:
     home_x, home_y = enemy.ai_home_pos
     radius_px = PATROL_RADIUS_TILES * TILE_SIZE
 
+    rng = game.rng.stream("ai")
     for _ in range(8):  # try a few times to find something walkable
-        angle = random.random() * 2.0 * math.pi
-        r = random.random() * radius_px
+        angle = rng.random() * 2.0 * math.pi
+        r = rng.random() * radius_px
         px = home_x + math.cos(angle) * r
         py = home_y + math.sin(angle) * r
 
@@ -202,65 +295,74 @@ def _alert_nearby_enemies(source_enemy: "Enemy", game: "Game", last_seen_pos: Tu
 
     # Use a radius in *world* space (pixels) derived from tile units.
     alert_radius_px = ALERT_RADIUS_TILES * TILE_SIZE
-    alert_radius_sq = alert_radius_px * alert_radius_px
 
     sx, sy = source_enemy.rect.center
 
-    for entity in getattr(current_map, "entities", []):
+    # Only care about other living enemies within the shout radius
+    for entity in current_map.entities_in_radius(sx, sy, alert_radius_px, kind=Enemy):
         if entity is source_enemy:
             continue
-        # Only care about other living enemies
-        if not isinstance(entity, Enemy):
-            continue
         if getattr(entity, "hp", 1) <= 0:
             continue
 
-        _ensure_ai_fields(entity)
+        _ensure_ai_fields(entity, game.rng.stream("ai"))
 
         # Don't override enemies already actively chasing
         if entity.ai_state not in ("idle", "search"):
             continue
 
-        ox, oy = entity.rect.center
-        dx = ox - sx
-        dy = oy - sy
-        if dx * dx + dy * dy > alert_radius_sq:
-            continue
-
         # Alert this enemy: they know *where* the player was seen,
         # and will move there in "search" mode.
-        entity.ai_state = "search"
+        _set_ai_state(entity, "search")
         entity.ai_last_seen_player_pos = last_seen_pos
         entity.ai_search_time = SEARCH_DURATION
 
 
 def update_enemy_ai(enemy: "Enemy", game: "Game", dt: float) -> None:
     """
-    Exploration AI 2.1:
+    Exploration AI 2.1 (one enemy, think + act in the same call):
 
     - Enemies only notice the player if:
         * within DETECTION_RANGE_TILES, AND
-        * line-of-sight is clear (no walls).
+        * line-of-sight is clear (no walls) — read from the player's
+          symmetric visibility field, or a per-enemy LoS walk depending
+          on DETECTION_MODE.
 
     - States:
-        * idle   : patrol around their home position until they spot you
-        * chase  : move directly towards you while they see you
-        * search : move to the last seen position for a short time
+        * idle   : patrol (A* paths) around their home position until they spot you
+        * chase  : path towards you (shared flow field) while they see you
+        * search : A* path to the last seen position for a short time
 
     - If search timer expires or they reach the last seen spot, they go idle
       and resume patrolling.
+
+    AIScheduler calls the two halves separately: think_enemy_ai within a
+    per-frame time budget, act_enemy_ai for every enemy every frame.
     """
-    _ensure_ai_fields(enemy)
+    think_enemy_ai(enemy, game, dt)
+    act_enemy_ai(enemy, game, dt)
 
-    if game.player is None or game.current_map is None:
-        return
 
+def _ai_can_run(enemy: "Enemy", game: "Game") -> bool:
+    if game.player is None or game.current_map is None:
+        return False
     # No chasing during post-battle grace
     if game.post_battle_grace > 0.0:
-        return
-
+        return False
     # Dead enemies shouldn't move
     if getattr(enemy, "hp", 1) <= 0:
+        return False
+    return True
+
+
+def think_enemy_ai(enemy: "Enemy", game: "Game", dt: float) -> None:
+    """
+    Decision half of the AI: detection, state transitions, alerting
+    nearby enemies, search / patrol timers, patrol target selection and
+    path requests. ``dt`` is the time since this enemy last thought.
+    """
+    _ensure_ai_fields(enemy, game.rng.stream("ai"))
+    if not _ai_can_run(enemy, game):
         return
 
     # Tile coords
@@ -275,11 +377,16 @@ def update_enemy_ai(enemy: "Enemy", game: "Game", dt: float) -> None:
     dist_tiles_sq = dx_tiles * dx_tiles + dy_tiles * dy_tiles
     detection_sq = DETECTION_RANGE_TILES * DETECTION_RANGE_TILES
 
-    # LoS: use the same Bresenham-based check as FOV, from enemy to player.
     can_see_player = False
-    if dist_tiles_sq <= detection_sq:
-        # _line_of_sight is "private" but it's exactly what we want
-        if game.current_map._line_of_sight(et_x, et_y, pt_x, pt_y):
+    if DETECTION_MODE == "fov":
+        # Symmetric FOV: the enemy sees the player iff its tile is visible
+        # from the player's tile (range is the field's radius).
+        sight = game.current_map.visibility_from(pt_x, pt_y, DETECTION_RANGE_TILES)
+        if game.current_map.in_bounds(et_x, et_y):
+            can_see_player = bool(sight[et_y, et_x])
+    elif dist_tiles_sq <= detection_sq:
+        # Cached per tile pair on the map
+        if game.current_map.line_of_sight(et_x, et_y, pt_x, pt_y):
             can_see_player = True
 
     state = enemy.ai_state
@@ -291,36 +398,31 @@ def update_enemy_ai(enemy: "Enemy", game: "Game", dt: float) -> None:
         enemy.ai_search_time = SEARCH_DURATION
 
         if state in ("idle", "search"):
-            enemy.ai_state = "chase"
+            _set_ai_state(enemy, "chase")
             state = "chase"
             _alert_nearby_enemies(enemy, game, (px, py))
     else:
         # No LoS this frame
         if state == "chase":
             # Lost sight -> start searching
-            enemy.ai_state = "search"
+            _set_ai_state(enemy, "search")
             state = "search"
 
-    # --- Behaviour by state ---
+    # --- Decisions by state ---
     if state == "idle":
         # Patrol around their home position when not seeing the player
-        _update_patrol(enemy, game, dt)
-        return
-
-    if state == "chase":
-        # Move directly towards the *current* player position
-        _move_enemy_towards(enemy, px, py, game, dt, allow_battle=True, speed_factor=1.0)
+        _think_patrol(enemy, game, dt)
         return
 
     if state == "search":
         # Move towards the last seen player position, but only for a while
         if enemy.ai_last_seen_player_pos is None:
-            enemy.ai_state = "idle"
+            _set_ai_state(enemy, "idle")
             return
 
         enemy.ai_search_time -= dt
         if enemy.ai_search_time <= 0.0:
-            enemy.ai_state = "idle"
+            _set_ai_state(enemy, "idle")
             enemy.ai_last_seen_player_pos = None
             return
 
@@ -331,16 +433,226 @@ def update_enemy_ai(enemy: "Enemy", game: "Game", dt: float) -> None:
         if (dx * dx + dy * dy) <= (
             STOP_SEARCH_DISTANCE_TILES * STOP_SEARCH_DISTANCE_TILES * TILE_SIZE * TILE_SIZE
         ):
-            enemy.ai_state = "idle"
+            _set_ai_state(enemy, "idle")
             enemy.ai_last_seen_player_pos = None
             return
 
-        _move_enemy_towards(
-            enemy,
-            lx,
-            ly,
-            game,
-            dt,
-            allow_battle=True,
-            speed_factor=1.0,
-        )
+        status, _ = _path_waypoint(enemy, lx, ly, game)
+        if status == PATH_UNREACHABLE:
+            _set_ai_state(enemy, "idle")
+            enemy.ai_last_seen_player_pos = None
+
+
+def _movement_intent(enemy: "Enemy", game: "Game") -> Optional[MoveIntent]:
+    """
+    Where this enemy wants to move this frame, as (target_x, target_y,
+    speed_factor, allow_battle), using only cached paths / flow fields.
+    None if it stays put.
+    """
+    if not _ai_can_run(enemy, game):
+        return None
+
+    state = enemy.ai_state
+
+    if state == "idle":
+        return _patrol_move(enemy, game)
+
+    if state == "chase":
+        # Follow the shared flow field towards the *current* player position
+        px, py = game.player.rect.center
+        tx, ty = _route_towards(enemy, px, py, game)
+        return tx, ty, 1.0, True
+
+    if state == "search":
+        if enemy.ai_last_seen_player_pos is None:
+            return None
+        lx, ly = enemy.ai_last_seen_player_pos
+        _, waypoint = _path_waypoint(enemy, lx, ly, game, search=False)
+        if waypoint is None:
+            return None  # path still being searched
+        tx, ty = waypoint
+        return tx, ty, 1.0, True
+
+    return None
+
+
+def act_enemy_ai(enemy: "Enemy", game: "Game", dt: float) -> None:
+    """
+    Movement half of the AI for a single enemy (AIScheduler moves all
+    due enemies together with move_enemies_batch instead).
+    """
+    intent = _movement_intent(enemy, game)
+    if intent is None:
+        return
+    tx, ty, speed_factor, allow_battle = intent
+    _move_enemy_towards(
+        enemy,
+        tx,
+        ty,
+        game,
+        dt,
+        allow_battle=allow_battle,
+        speed_factor=speed_factor,
+    )
+
+
+def move_enemies_batch(
+    game: "Game",
+    moves: List[Tuple["Enemy", MoveIntent]],
+    dts: List[float],
+) -> None:
+    """
+    Batched _move_enemy_towards for many enemies.
+
+    Directions, step lengths and wall collision (including the slide
+    fallback) are computed for all movers at once with NumPy against the
+    map's walkable array. Entity blocking and player contact are then
+    resolved mover by mover through the spatial grid, in order, so an
+    enemy that just moved blocks the ones after it exactly as before.
+    """
+    current_map = game.current_map
+    if current_map is None or game.player is None or not moves:
+        return
+
+    n = len(moves)
+    enemies = [enemy for enemy, _ in moves]
+    x = np.fromiter((e.x for e in enemies), dtype=np.float64, count=n)
+    y = np.fromiter((e.y for e in enemies), dtype=np.float64, count=n)
+    w = np.fromiter((e.width for e in enemies), dtype=np.int64, count=n)
+    h = np.fromiter((e.height for e in enemies), dtype=np.int64, count=n)
+    tx = np.fromiter((m[0] for _, m in moves), dtype=np.float64, count=n)
+    ty = np.fromiter((m[1] for _, m in moves), dtype=np.float64, count=n)
+    speed = np.fromiter(
+        (e.speed * m[2] for e, m in moves), dtype=np.float64, count=n
+    ) * np.asarray(dts, dtype=np.float64)
+
+    # Same centre as Rect.center: int position + half size (floored)
+    dx = tx - (x.astype(np.int64) + w // 2)
+    dy = ty - (y.astype(np.int64) + h // 2)
+    length = np.hypot(dx, dy)
+    moving = length > 0
+    scale = np.divide(speed, length, out=np.zeros(n), where=moving)
+    new_x = x + dx * scale
+    new_y = y + dy * scale
+
+    # Walls, then the slide-along-one-axis fallback
+    ok = current_map.rects_can_move_to(new_x, new_y, w, h)
+    blocked = moving & ~ok
+    slide_x = blocked & (new_x != x) & current_map.rects_can_move_to(new_x, y, w, h)
+    slide_y = blocked & ~slide_x & (new_y != y) & current_map.rects_can_move_to(x, new_y, w, h)
+    final_x = np.where(ok | slide_x, new_x, x).tolist()
+    final_y = np.where(ok | slide_y, new_y, y).tolist()
+    can_move = (moving & (ok | slide_x | slide_y)).tolist()
+
+    player_rect = game.player.rect
+    for i, enemy in enumerate(enemies):
+        if not can_move[i] or not current_map.has_entity(enemy):
+            continue
+        nx = final_x[i]
+        ny = final_y[i]
+        new_rect = pygame.Rect(int(nx), int(ny), enemy.width, enemy.height)
+
+        # Don't walk through other blocking entities
+        if any(
+            other is not enemy and getattr(other, "blocks_movement", False)
+            for other in current_map.entities_in_rect(new_rect)
+        ):
+            continue
+
+        # If we're allowed to, colliding with the player can trigger battle
+        if moves[i][1][3] and new_rect.colliderect(player_rect):
+            enemy.move_to(new_rect.x, new_rect.y)
+            if game.post_battle_grace <= 0.0:
+                game.start_battle(enemy)
+            continue
+
+        enemy.move_to(nx, ny)
+
+
+class AIScheduler:
+    """
+    Per-frame driver for all enemy AI on the current floor.
+
+    - LOD tiers (AI_LOD_* above) decide which enemies are due this frame
+      and with how much dt: near / hunting enemies every frame, far ones
+      every AI_LOD_FAR_INTERVAL with their banked time, dormant ones not
+      at all.
+    - Thinking (think_enemy_ai) gets ``budget_ms`` per frame. Due enemies
+      think in order of how long they've gone without thinking, so work
+      round-robins across frames and a whole pack switching to chase at
+      once is spread out instead of landing on one frame. At least one
+      enemy thinks every frame.
+    - Movement runs for every due enemy every frame, batched through
+      move_enemies_batch.
+
+    Each enemy banks the time since its last think in ``ai_think_dt``, so
+    search / patrol timers stay correct however often it gets to think.
+    """
+
+    def __init__(self, budget_ms: float = AI_THINK_BUDGET_MS) -> None:
+        self.budget_ms = budget_ms
+
+    def update(self, game: "Game", dt: float) -> None:
+        current_map = game.current_map
+        if current_map is None or game.player is None:
+            return
+
+        current_map.paths.begin_frame(dt)
+
+        px, py = game.player.rect.center
+        near_sq = (AI_LOD_NEAR_TILES * TILE_SIZE) ** 2
+        wake_sq = (AI_WAKE_RADIUS_TILES * TILE_SIZE) ** 2
+
+        # --- LOD: who runs this frame, and with what dt ---
+        # One pass over the store's component arrays picks the tier of
+        # every enemy; only non-dormant enemies are touched as objects.
+        store = current_map.entities
+        slots = store.slots_of_kind(KIND_ENEMY)
+        cx, cy = store.centers()
+        dist_sq = (cx[slots] - px) ** 2 + (cy[slots] - py) ** 2
+        hunting = store.ai_state[slots] > AI_STATE_CODES["idle"]
+        full_rate = (dist_sq <= near_sq) | hunting
+        awake = full_rate | (dist_sq <= wake_sq)
+
+        ai_rng = game.rng.stream("ai")
+        due: List[Tuple[Enemy, float]] = []
+        for enemy, full in zip(
+            store.objects(slots[awake]), full_rate[awake].tolist()
+        ):
+            _ensure_ai_fields(enemy, ai_rng)
+            if full:
+                # Near, or actively hunting: full rate
+                enemy.ai_lod_dt = 0.0
+                due.append((enemy, dt))
+            else:
+                enemy.ai_lod_dt += dt
+                if enemy.ai_lod_dt >= AI_LOD_FAR_INTERVAL:
+                    due.append((enemy, enemy.ai_lod_dt))
+                    enemy.ai_lod_dt = 0.0
+        # (everything else is dormant)
+
+        for enemy, step in due:
+            enemy.ai_think_dt += step
+
+        # --- Think: longest-waiting first, until the budget runs out ---
+        thinkers = sorted(due, key=lambda item: item[0].ai_think_dt, reverse=True)
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        thought = 0
+        for enemy, _ in thinkers:
+            if thought and time.perf_counter() >= deadline:
+                break
+            think_enemy_ai(enemy, game, enemy.ai_think_dt)
+            enemy.ai_think_dt = 0.0
+            thought += 1
+
+        # --- Act: everyone due moves this frame, in one batch ---
+        moves: List[Tuple[Enemy, MoveIntent]] = []
+        dts: List[float] = []
+        for enemy, step in due:
+            if not current_map.has_entity(enemy):
+                continue  # removed mid-frame (battle started)
+            intent = _movement_intent(enemy, game)
+            if intent is not None:
+                moves.append((enemy, intent))
+                dts.append(step)
+        move_enemies_batch(game, moves, dts)
@@ -1,31 +1,63 @@
-from dataclasses import dataclass
-from typing import Tuple
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import pygame
 
 from settings import COLOR_PLAYER, COLOR_ENEMY
 
+if TYPE_CHECKING:
+    from world.entity_store import EntityStore
+
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Entity:
-    """Base entity that lives in the world."""
+    """
+    Base entity that lives in the world.
+
+    Entities are slotted and compare by identity. ``rect`` is cached and
+    kept in sync by move_to / move_by, so always move entities through
+    those (and treat the returned rect as read-only).
+    """
     x: float
     y: float
     width: int
     height: int
     blocks_movement: bool = True
 
+    # Store of the map this entity lives on, and its stable id there
+    # (both set by GameMap.add_entity)
+    entity_store: Optional["EntityStore"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    entity_id: int = field(default=-1, init=False, repr=False, compare=False)
+    _rect: pygame.Rect = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Set explicitly: non-slotted subclasses (Player) don't get the
+        # init=False default assigned by the generated __init__.
+        self.entity_store = None
+        self.entity_id = -1
+        self._rect = pygame.Rect(int(self.x), int(self.y), self.width, self.height)
+
     @property
     def rect(self) -> pygame.Rect:
-        return pygame.Rect(int(self.x), int(self.y), self.width, self.height)
+        return self._rect
 
     def move_to(self, x: float, y: float) -> None:
         self.x = x
         self.y = y
+        self._rect.topleft = (int(x), int(y))
+        if self.entity_store is not None:
+            self.entity_store.moved(self)
 
     def move_by(self, dx: float, dy: float) -> None:
         self.x += dx
         self.y += dy
+        self._rect.topleft = (int(self.x), int(self.y))
+        if self.entity_store is not None:
+            self.entity_store.moved(self)
 
     def draw(
         self,
@@ -52,11 +84,14 @@ class Entity:
         pygame.draw.rect(surface, color, screen_rect)
 
 
-@dataclass
+@dataclass(eq=False)
 class Player(Entity):
     """
     Player entity.
     Later we'll add class, stats, inventory, etc.
+
+    Not slotted: hero/companion setup attaches extra attributes
+    (perks, defense, skill_power, ...) at runtime.
     """
     speed: float = 200.0
     color: Tuple[int, int, int] = COLOR_PLAYER
@@ -92,15 +127,33 @@ class Player(Entity):
         return self.hp > 0
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Enemy(Entity):
-    """Simple enemy placeholder (no AI yet, just blocks & takes hits)."""
-    speed: float = 0.0  # will matter once we add AI
+    """Map enemy: blocks movement, wanders/chases via world.ai, fights in battle."""
+    speed: float = 0.0
     color: Tuple[int, int, int] = COLOR_ENEMY
 
+    # Combat stats (filled in from the archetype at spawn time)
     max_hp: int = 12
     hp: int = 12
     attack_power: int = 4
+    defense: int = 0
+    xp_reward: int = 0
+
+    # Archetype metadata
+    enemy_type: str = "Enemy"
+    archetype_id: Optional[str] = None
+    ai_profile: str = "brute"
+
+    # Exploration AI state (see world.ai)
+    ai_state: str = "idle"  # "idle" | "chase" | "search"
+    ai_search_time: float = 0.0
+    ai_last_seen_player_pos: Optional[Tuple[float, float]] = None
+    ai_home_pos: Optional[Tuple[float, float]] = None
+    ai_patrol_target: Optional[Tuple[float, float]] = None
+    ai_patrol_pause: float = 0.0
+    ai_lod_dt: float = 0.0  # frame time banked while in the far LOD tier
+    ai_think_dt: float = 0.0  # time since the scheduler last let it think
 
     def draw(
         self,
@@ -129,7 +182,7 @@ class Enemy(Entity):
         return self.hp > 0
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Chest(Entity):
     """Simple interactive chest placed on the exploration map.
 
@@ -141,6 +194,8 @@ class Chest(Entity):
     color_opened: Tuple[int, int, int] = (120, 120, 120)  # dull grey
 
     def __post_init__(self) -> None:
+        # Explicit base call: zero-arg super() doesn't work in slotted dataclasses
+        Entity.__post_init__(self)
         # Chests should not block movement in exploration.
         self.blocks_movement = False
 
@@ -165,7 +220,7 @@ class Chest(Entity):
         pygame.draw.rect(surface, color, screen_rect)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class EventNode(Entity):
     """
     Interactive map event (shrine, lore stone, cache, etc.).
@@ -177,6 +232,7 @@ class EventNode(Entity):
     color: Tuple[int, int, int] = (150, 120, 255)
 
     def __post_init__(self) -> None:
+        Entity.__post_init__(self)
         self.blocks_movement = False
 
     def draw(
@@ -199,7 +255,7 @@ class EventNode(Entity):
         pygame.draw.rect(surface, self.color, screen_rect)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Merchant(Entity):
     """
     Stationary merchant NPC used in shop rooms.
@@ -210,5 +266,6 @@ class Merchant(Entity):
     color: Tuple[int, int, int] = (200, 180, 255)
 
     def __post_init__(self) -> None:
+        Entity.__post_init__(self)
         # Merchants should feel like solid NPCs.
         self.blocks_movement = True
@@ -0,0 +1,216 @@
+# world/entity_store.py
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, ValuesView
+
+import numpy as np
+
+from world.entities import Chest, Enemy, EventNode, Merchant
+from world.spatial import SpatialGrid
+
+if TYPE_CHECKING:
+    from world.entities import Entity
+
+
+# Entity kind codes (the ``kind`` component)
+KIND_OTHER = 0
+KIND_ENEMY = 1
+KIND_CHEST = 2
+KIND_EVENT = 3
+KIND_MERCHANT = 4
+KINDS = (KIND_OTHER, KIND_ENEMY, KIND_CHEST, KIND_EVENT, KIND_MERCHANT)
+
+# Enemy AI state codes (the ``ai_state`` component); -1 for non-enemies
+AI_STATE_CODES: Dict[str, int] = {"idle": 0, "chase": 1, "search": 2}
+AI_STATE_NONE = -1
+
+_INITIAL_CAPACITY = 64
+
+
+def kind_of(entity: "Entity") -> int:
+    if isinstance(entity, Enemy):
+        return KIND_ENEMY
+    if isinstance(entity, Chest):
+        return KIND_CHEST
+    if isinstance(entity, EventNode):
+        return KIND_EVENT
+    if isinstance(entity, Merchant):
+        return KIND_MERCHANT
+    return KIND_OTHER
+
+
+class EntityStore:
+    """
+    Struct-of-arrays store for the entities on one map.
+
+    Entities keep their normal object API; the store mirrors the data
+    that per-frame systems scan (position, size, kind, AI state) in dense
+    NumPy component arrays, one row ("slot") per entity, so "all enemies
+    near the player" is an array pass instead of an isinstance loop over
+    objects.
+
+    - Every entity gets a stable ``entity_id`` on add; slots are not
+      stable (removal swaps the last row into the hole, so it's O(1)).
+    - Positions stay in sync through Entity.move_to / move_by, which call
+      moved(). The mirrored AI state must be pushed with refresh() after
+      it changes.
+    - Also owns the map's SpatialGrid and keeps it updated, plus one
+      bucket per kind (of_kind()) so code that wants "all chests" doesn't
+      filter every entity with isinstance.
+    - Iterating the store yields entity objects (list-like, in slot
+      order). Copy with list() before removing entities mid-loop.
+    """
+
+    def __init__(self, spatial: Optional[SpatialGrid] = None) -> None:
+        self.spatial: SpatialGrid = spatial if spatial is not None else SpatialGrid()
+
+        self._count = 0
+        self._objects: List["Entity"] = []
+        self._slot_of: Dict[int, int] = {}  # entity_id -> slot
+        self._next_id = 1
+
+        # kind -> {entity_id: entity}, in insertion order
+        self._buckets: Dict[int, Dict[int, "Entity"]] = {kind: {} for kind in KINDS}
+
+        self._alloc(_INITIAL_CAPACITY)
+
+    def _alloc(self, capacity: int) -> None:
+        def grow(old: Optional[np.ndarray], dtype, fill) -> np.ndarray:
+            arr = np.full(capacity, fill, dtype=dtype)
+            if old is not None:
+                arr[: self._count] = old[: self._count]
+            return arr
+
+        get = lambda name: getattr(self, name, None)  # noqa: E731
+        self.ids = grow(get("ids"), np.int64, 0)
+        self.kind = grow(get("kind"), np.int8, KIND_OTHER)
+        self.x = grow(get("x"), np.float64, 0.0)
+        self.y = grow(get("y"), np.float64, 0.0)
+        self.width = grow(get("width"), np.int32, 0)
+        self.height = grow(get("height"), np.int32, 0)
+        self.ai_state = grow(get("ai_state"), np.int8, AI_STATE_NONE)
+        self._capacity = capacity
+
+    # ------------------------------------------------------------------
+    # Container API
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator["Entity"]:
+        return iter(self._objects)
+
+    def __contains__(self, entity: object) -> bool:
+        slot = self._slot_of.get(getattr(entity, "entity_id", -1))
+        return slot is not None and self._objects[slot] is entity
+
+    def __getitem__(self, index: int) -> "Entity":
+        return self._objects[index]
+
+    def get(self, entity_id: int) -> Optional["Entity"]:
+        """Entity by stable id, or None if it's no longer on the map."""
+        slot = self._slot_of.get(entity_id)
+        return None if slot is None else self._objects[slot]
+
+    def of_kind(self, kind: int) -> ValuesView["Entity"]:
+        """Live view of every entity of one kind (KIND_*), in insertion order."""
+        return self._buckets[kind].values()
+
+    def objects(self, slots: np.ndarray) -> List["Entity"]:
+        """Entity objects for an array of slots (e.g. from a component mask)."""
+        objs = self._objects
+        return [objs[i] for i in slots.tolist()]
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, entity: "Entity") -> int:
+        """Add an entity, assign its stable id, and index it. Returns the id."""
+        if entity in self:
+            return entity.entity_id
+        if self._count == self._capacity:
+            self._alloc(self._capacity * 2)
+
+        entity_id = self._next_id
+        self._next_id += 1
+        entity.entity_id = entity_id
+
+        slot = self._count
+        self._count += 1
+        self._objects.append(entity)
+        self._slot_of[entity_id] = slot
+
+        kind = kind_of(entity)
+        self._buckets[kind][entity_id] = entity
+
+        self.ids[slot] = entity_id
+        self.kind[slot] = kind
+        self.width[slot] = entity.width
+        self.height[slot] = entity.height
+        self._write(slot, entity)
+
+        self.spatial.insert(entity)
+        entity.entity_store = self
+        return entity_id
+
+    def remove(self, entity: "Entity") -> bool:
+        """O(1) removal (swap with the last row). False if not present."""
+        if entity not in self:
+            return False
+
+        slot = self._slot_of.pop(entity.entity_id)
+        del self._buckets[int(self.kind[slot])][entity.entity_id]
+        last = self._count - 1
+        if slot != last:
+            moved = self._objects[last]
+            self._objects[slot] = moved
+            self._slot_of[moved.entity_id] = slot
+            for arr in (
+                self.ids, self.kind, self.x, self.y,
+                self.width, self.height, self.ai_state,
+            ):
+                arr[slot] = arr[last]
+        self._objects.pop()
+        self._count = last
+
+        self.spatial.remove(entity)
+        entity.entity_store = None
+        return True
+
+    def moved(self, entity: "Entity") -> None:
+        """Position hook called by Entity.move_to / move_by."""
+        slot = self._slot_of[entity.entity_id]
+        self.x[slot] = entity.x
+        self.y[slot] = entity.y
+        self.spatial.update(entity)
+
+    def refresh(self, entity: "Entity") -> None:
+        """Re-read the mirrored non-position fields (AI state) of an entity."""
+        slot = self._slot_of.get(entity.entity_id)
+        if slot is not None:
+            self._write(slot, entity)
+
+    def _write(self, slot: int, entity: "Entity") -> None:
+        self.x[slot] = entity.x
+        self.y[slot] = entity.y
+        if isinstance(entity, Enemy):
+            self.ai_state[slot] = AI_STATE_CODES.get(entity.ai_state, AI_STATE_NONE)
+        else:
+            self.ai_state[slot] = AI_STATE_NONE
+
+    # ------------------------------------------------------------------
+    # Array views (length == len(self); valid until the next add/remove)
+    # ------------------------------------------------------------------
+
+    def centers(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rect centres (same rounding as Entity.rect.center)."""
+        n = self._count
+        cx = self.x[:n].astype(np.int64) + self.width[:n] // 2
+        cy = self.y[:n].astype(np.int64) + self.height[:n] // 2
+        return cx, cy
+
+    def slots_of_kind(self, kind: int) -> np.ndarray:
+        return np.flatnonzero(self.kind[: self._count] == kind)
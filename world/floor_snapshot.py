@@ -0,0 +1,85 @@
+# world/floor_snapshot.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple
+
+import numpy as np
+
+from world.entities import Chest
+from world.game_map import GameMap
+
+
+# Floors within this many levels of the current one stay fully loaded;
+# anything further away is compacted to a FloorSnapshot.
+HOT_FLOOR_RADIUS = 1
+
+
+@dataclass(slots=True, frozen=True)
+class FloorSnapshot:
+    """
+    Compact record of a visited floor that was evicted from memory.
+
+    The layout and spawns aren't stored: they're regenerated from the run
+    seed (see systems.rng), which reproduces the same entities in the same
+    order, so entity ids 1..spawn_count identify the original spawns.
+    Only the player's changes are kept:
+
+    - removed: spawn ids no longer on the map (killed enemies, triggered
+      events)
+    - opened_chests: spawn ids of chests that were opened
+    - explored: the explored mask, bit-packed (np.packbits)
+    """
+    floor_index: int
+    shape: Tuple[int, int]
+    explored: bytes
+    removed: FrozenSet[int]
+    opened_chests: FrozenSet[int]
+
+
+def snapshot_floor(floor_index: int, game_map: GameMap) -> FloorSnapshot:
+    """Capture what the player changed on ``game_map`` since it was generated."""
+    # Entities added after generation aren't reproducible from the seed
+    spawn_count = game_map.spawn_count
+    present = {
+        entity.entity_id for entity in game_map.entities if entity.entity_id <= spawn_count
+    }
+    opened = {
+        chest.entity_id
+        for chest in game_map.chests
+        if chest.opened and chest.entity_id <= spawn_count
+    }
+
+    removed = frozenset(range(1, game_map.spawn_count + 1)) - present
+    return FloorSnapshot(
+        floor_index=floor_index,
+        shape=game_map.explored_mask.shape,
+        explored=np.packbits(game_map.explored_mask).tobytes(),
+        removed=removed,
+        opened_chests=frozenset(opened),
+    )
+
+
+def restore_floor(game_map: GameMap, snapshot: FloorSnapshot) -> None:
+    """Re-apply a snapshot to a freshly regenerated copy of its floor."""
+    if game_map.explored_mask.shape != snapshot.shape:
+        raise ValueError(
+            f"Floor {snapshot.floor_index} regenerated with shape "
+            f"{game_map.explored_mask.shape}, snapshot has {snapshot.shape}"
+        )
+
+    height, width = snapshot.shape
+    bits = np.unpackbits(np.frombuffer(snapshot.explored, dtype=np.uint8), count=height * width)
+    game_map.explored_mask = bits.astype(bool).reshape(height, width)
+    game_map.mark_fog_dirty()
+
+    store = game_map.entities
+    for spawn_id in snapshot.removed:
+        entity = store.get(spawn_id)
+        if entity is not None:
+            game_map.remove_entity(entity)
+    for spawn_id in snapshot.opened_chests:
+        chest = store.get(spawn_id)
+        if isinstance(chest, Chest):
+            chest.opened = True
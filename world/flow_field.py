@@ -0,0 +1,138 @@
+# world/flow_field.py
+
+from __future__ import annotations
+
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Distance value for tiles that can't reach the goal (walls, sealed-off areas).
+UNREACHABLE = -1
+
+# How many goal fields a map keeps around (player tile + a few last-seen spots).
+FLOW_FIELD_CACHE_SIZE = 8
+
+# Orthogonal steps first so ties prefer straight moves over diagonals.
+_STEPS: Tuple[Tuple[int, int], ...] = (
+    (1, 0), (-1, 0), (0, 1), (0, -1),
+    (1, 1), (1, -1), (-1, 1), (-1, -1),
+)
+
+
+class FlowField:
+    """
+    Distance map (in steps) from every walkable tile to one goal tile.
+
+    Built once with a breadth-first flood from the goal over 8-connected
+    walkable tiles (equal step cost, so BFS == Dijkstra here), then shared
+    by every enemy heading for that goal: each one just steps to the
+    neighbouring tile with the smallest distance.
+
+    Diagonal steps are only allowed when both orthogonal neighbours are
+    walkable, so entities never try to squeeze past a wall corner.
+    """
+
+    def __init__(self, walkable: np.ndarray, goal_tx: int, goal_ty: int) -> None:
+        self.height, self.width = walkable.shape
+        self.goal: Tuple[int, int] = (goal_tx, goal_ty)
+        self.distance: np.ndarray = _flood(walkable, goal_tx, goal_ty)
+
+    def distance_at(self, tx: int, ty: int) -> int:
+        """Steps from (tx, ty) to the goal, or UNREACHABLE."""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return int(self.distance[ty, tx])
+        return UNREACHABLE
+
+    def next_step(self, tx: int, ty: int) -> Optional[Tuple[int, int]]:
+        """
+        Neighbouring tile one step closer to the goal.
+
+        Returns None at the goal itself or when (tx, ty) can't reach it.
+        """
+        here = self.distance_at(tx, ty)
+        if here <= 0:
+            return None
+
+        dist = self.distance
+        w, h = self.width, self.height
+        best: Optional[Tuple[int, int]] = None
+        best_d = here
+        for dx, dy in _STEPS:
+            nx = tx + dx
+            ny = ty + dy
+            if not (0 <= nx < w and 0 <= ny < h):
+                continue
+            d = dist[ny, nx]
+            if d < 0 or d >= best_d:
+                continue
+            if dx and dy and (dist[ty, nx] < 0 or dist[ny, tx] < 0):
+                continue
+            best = (nx, ny)
+            best_d = d
+        return best
+
+
+def _flood(walkable: np.ndarray, goal_tx: int, goal_ty: int) -> np.ndarray:
+    """BFS step distances from the goal over 8-connected walkable tiles."""
+    height, width = walkable.shape
+    n = width * height
+    dist: List[int] = [UNREACHABLE] * n
+
+    if not (0 <= goal_tx < width and 0 <= goal_ty < height) or not walkable[goal_ty, goal_tx]:
+        return np.full((height, width), UNREACHABLE, dtype=np.int32)
+
+    # Flat lists are much faster than 2D numpy indexing in a Python loop
+    walk: List[bool] = walkable.ravel().tolist()
+
+    start = goal_ty * width + goal_tx
+    dist[start] = 0
+    queue = deque([start])
+
+    while queue:
+        i = queue.popleft()
+        y, x = divmod(i, width)
+        nd = dist[i] + 1
+
+        left = x > 0 and walk[i - 1]
+        right = x < width - 1 and walk[i + 1]
+        up = y > 0 and walk[i - width]
+        down = y < height - 1 and walk[i + width]
+
+        if left and dist[i - 1] < 0:
+            dist[i - 1] = nd
+            queue.append(i - 1)
+        if right and dist[i + 1] < 0:
+            dist[i + 1] = nd
+            queue.append(i + 1)
+        if up and dist[i - width] < 0:
+            dist[i - width] = nd
+            queue.append(i - width)
+        if down and dist[i + width] < 0:
+            dist[i + width] = nd
+            queue.append(i + width)
+
+        # Diagonals: no cutting wall corners
+        if up and left:
+            j = i - width - 1
+            if walk[j] and dist[j] < 0:
+                dist[j] = nd
+                queue.append(j)
+        if up and right:
+            j = i - width + 1
+            if walk[j] and dist[j] < 0:
+                dist[j] = nd
+                queue.append(j)
+        if down and left:
+            j = i + width - 1
+            if walk[j] and dist[j] < 0:
+                dist[j] = nd
+                queue.append(j)
+        if down and right:
+            j = i + width + 1
+            if walk[j] and dist[j] < 0:
+                dist[j] = nd
+                queue.append(j)
+
+    return np.array(dist, dtype=np.int32).reshape(height, width)
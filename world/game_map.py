@@ -1,51 +1,368 @@
 # world/game_map.py
 
-from typing import List, Tuple, Set
+import math
+from collections import OrderedDict
+from collections.abc import MutableSet
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, ValuesView
 
+import numpy as np
 import pygame
 
 from settings import TILE_SIZE
-from world.tiles import Tile
-from world.entities import Entity
+from world.tiles import (
+    Tile,
+    TILE_PALETTE,
+    COLOR_LUT,
+    WALKABLE_LUT,
+    TRANSPARENT_LUT,
+    tile_id_for,
+    tiles_to_ids,
+)
+from world.ai import DETECTION_RANGE_TILES
+from world.entities import Chest, Entity, Merchant
+from world.entity_store import (
+    KIND_CHEST,
+    KIND_ENEMY,
+    KIND_MERCHANT,
+    EntityStore,
+)
+from world.flow_field import FLOW_FIELD_CACHE_SIZE, FlowField
+from world.path_service import PathService
+from world.room_graph import RoomGraph
 from world.mapgen import RectRoom  # NEW: to type rooms list
+from world.map_renderer import FOG_FACTOR_LUT, MapRenderer
+from world.spatial import SpatialGrid
+
+
+# ----------------------------------------------------------------------
+# FOV engines
+# ----------------------------------------------------------------------
+#
+# An FOV engine has the signature
+#     engine(game_map, origin_x, origin_y, radius, reveal) -> None
+# and calls reveal(x, y) for every in-bounds tile visible from the origin
+# within a circular radius (origin included). GameMap.compute_fov picks
+# one from FOV_ALGORITHMS by name.
+
+RevealFn = Callable[[int, int], None]
+
+# Octant transforms: map (depth, col) to (dx, dy) as
+# dx = col * xx + depth * xy, dy = col * yx + depth * yy.
+_QUADRANTS = (
+    (1, 0, 0, -1),   # north
+    (1, 0, 0, 1),    # south
+    (0, 1, 1, 0),    # east
+    (0, -1, 1, 0),   # west
+)
+
+
+def _shadowcast(
+    game_map: "GameMap",
+    origin_x: int,
+    origin_y: int,
+    radius: int,
+    reveal: RevealFn,
+    symmetric: bool,
+) -> None:
+    """
+    Recursive shadowcasting (after Albert Ford's "Symmetric Shadowcasting").
+
+    Each quadrant is scanned row by row outward from the origin; every
+    tile in a lit span is looked at once, and walls split the span into
+    narrower child scans. Slopes are kept as exact integer fractions
+    (num, den) so there is no float drift on tile edges.
+
+    symmetric=True only reveals floor tiles whose *centre* is inside the
+    lit span, which makes visibility symmetric (A sees B <=> B sees A).
+    symmetric=False is the permissive variant: any floor tile touched by
+    the span is revealed.
+    """
+    rows = game_map.transparent_rows()
+    width = game_map.width
+    height = game_map.height
+    radius_sq = radius * radius
+
+    reveal(origin_x, origin_y)
+
+    for xx, xy, yx, yy in _QUADRANTS:
+
+        def scan(depth: int, start_num: int, start_den: int, end_num: int, end_den: int) -> None:
+            if depth > radius:
+                return
+
+            # min_col = round_half_up(depth * start), max_col = round_half_down(depth * end)
+            min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+            max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+
+            prev_wall: bool | None = None
+            for col in range(min_col, max_col + 1):
+                x = origin_x + col * xx + depth * xy
+                y = origin_y + col * yx + depth * yy
+                in_bounds = 0 <= x < width and 0 <= y < height
+                wall = not in_bounds or not rows[y][x]
+
+                if in_bounds and col * col + depth * depth <= radius_sq:
+                    if (
+                        wall
+                        or not symmetric
+                        or (
+                            col * start_den >= depth * start_num
+                            and col * end_den <= depth * end_num
+                        )
+                    ):
+                        reveal(x, y)
+
+                if prev_wall is True and not wall:
+                    # Leaving a wall: the lit span restarts at this tile's left edge
+                    start_num, start_den = 2 * col - 1, 2 * depth
+                elif prev_wall is False and wall:
+                    # Entering a wall: scan the lit span so far one row deeper
+                    scan(depth + 1, start_num, start_den, 2 * col - 1, 2 * depth)
+                prev_wall = wall
+
+            if prev_wall is False:
+                scan(depth + 1, start_num, start_den, end_num, end_den)
+
+        scan(1, -1, 1, 1, 1)
+
+
+def fov_symmetric_shadowcast(
+    game_map: "GameMap", origin_x: int, origin_y: int, radius: int, reveal: RevealFn
+) -> None:
+    """Symmetric recursive shadowcasting (the default engine)."""
+    _shadowcast(game_map, origin_x, origin_y, radius, reveal, symmetric=True)
+
+
+def fov_permissive_shadowcast(
+    game_map: "GameMap", origin_x: int, origin_y: int, radius: int, reveal: RevealFn
+) -> None:
+    """Permissive shadowcasting: reveals any floor tile partly inside a lit span."""
+    _shadowcast(game_map, origin_x, origin_y, radius, reveal, symmetric=False)
+
+
+FOV_ALGORITHMS: Dict[str, Callable[["GameMap", int, int, int, RevealFn], None]] = {
+    "symmetric": fov_symmetric_shadowcast,
+    "permissive": fov_permissive_shadowcast,
+}
+
+DEFAULT_FOV_ALGORITHM = "symmetric"
+
+
+# Line-of-sight cache: only pairs within enemy detection range (Chebyshev,
+# tiles) are cached, and at most LOS_CACHE_MAX_ENTRIES results are kept per
+# map. Only used by the "los" detection mode (see world.ai.DETECTION_MODE);
+# the default "fov" mode reads visibility_from instead.
+LOS_CACHE_RANGE_TILES = DETECTION_RANGE_TILES
+LOS_CACHE_MAX_ENTRIES = 65536
+
+# Pending fog-dirty rects kept per map before they're collapsed into a
+# single whole-map rect (e.g. while nothing is drawing the map).
+FOG_DIRTY_MAX_RECTS = 64
+
+_TileRect = Tuple[int, int, int, int]  # (x0, y0, x1, y1), end-exclusive
+
+
+class TileMaskView(MutableSet):
+    """
+    Set-compatible view over a (height, width) boolean tile mask.
+
+    Lets older code keep treating GameMap.visible / GameMap.explored as a
+    Set[Tuple[int, int]] of (tx, ty) — ``in``, iteration, len(), add(),
+    discard() — while the data lives in a compact NumPy array. Writes go
+    straight through to the mask and are reported to ``on_write`` with
+    the changed tile rect (so the owning map can track fog changes).
+    """
+
+    __slots__ = ("mask", "on_write")
+
+    def __init__(
+        self,
+        mask: np.ndarray,
+        on_write: Callable[[_TileRect | None], None] | None = None,
+    ) -> None:
+        self.mask = mask
+        self.on_write = on_write
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[Tuple[int, int]]) -> set:
+        # Binary set operators (view | other, view - other, ...) return plain sets
+        return set(it)
+
+    def __contains__(self, coord: object) -> bool:
+        try:
+            tx, ty = coord  # type: ignore[misc]
+        except (TypeError, ValueError):
+            return False
+        height, width = self.mask.shape
+        if not (0 <= tx < width and 0 <= ty < height):
+            return False
+        return bool(self.mask[ty, tx])
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        ys, xs = np.nonzero(self.mask)
+        return zip(xs.tolist(), ys.tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.mask))
+
+    def add(self, coord: Tuple[int, int]) -> None:
+        # Out-of-range coordinates are ignored (a mask can't hold them)
+        tx, ty = coord
+        height, width = self.mask.shape
+        if not (0 <= tx < width and 0 <= ty < height):
+            return
+        self.mask[ty, tx] = True
+        if self.on_write is not None:
+            self.on_write((tx, ty, tx + 1, ty + 1))
+
+    def discard(self, coord: Tuple[int, int]) -> None:
+        if coord in self:
+            tx, ty = coord
+            self.mask[ty, tx] = False
+            if self.on_write is not None:
+                self.on_write((tx, ty, tx + 1, ty + 1))
+
+    def clear(self) -> None:
+        self.mask.fill(False)
+        if self.on_write is not None:
+            self.on_write(None)
+
+    def __repr__(self) -> str:
+        return f"TileMaskView({len(self)} tiles)"
+
+
+def _mask_from_coords(coords: Iterable[Tuple[int, int]], width: int, height: int) -> np.ndarray:
+    """Build a (height, width) boolean mask from (tx, ty) pairs or another view."""
+    if isinstance(coords, TileMaskView):
+        return coords.mask.copy()
+    mask = np.zeros((height, width), dtype=bool)
+    for tx, ty in coords:
+        if 0 <= tx < width and 0 <= ty < height:
+            mask[ty, tx] = True
+    return mask
 
 
 class GameMap:
     """
     Represents a single map (dungeon floor, village, etc.).
     Holds tiles and provides collision, FOV, and drawing helpers.
+
+    Tiles are stored compactly as a (height, width) uint8 array of palette
+    ids (see world.tiles.TILE_PALETTE), indexed [y, x]. The boolean
+    ``walkable`` / ``transparent`` arrays are derived from it and kept in
+    sync by set_tile().
     """
 
     def __init__(
         self,
-        tiles: List[List[Tile]],
+        tiles: np.ndarray | List[List[Tile]],
         up_stairs: Tuple[int, int] | None = None,
         down_stairs: Tuple[int, int] | None = None,
         entities: list[Entity] | None = None,
         rooms: list[RectRoom] | None = None,
     ) -> None:
-        self.tiles: List[List[Tile]] = tiles
-        self.height: int = len(tiles)
-        self.width: int = len(tiles[0]) if self.height > 0 else 0
+        # Accept either a tile-id array (mapgen) or a legacy Tile grid
+        if isinstance(tiles, np.ndarray):
+            tile_ids = tiles.astype(np.uint8, copy=False)
+        else:
+            tile_ids = tiles_to_ids(tiles)
+
+        self.tile_ids: np.ndarray = tile_ids
+        self.height: int = int(tile_ids.shape[0])
+        self.width: int = int(tile_ids.shape[1])
+
+        # Derived per-tile lookups (one vectorised pass each)
+        self.walkable: np.ndarray = WALKABLE_LUT[tile_ids]
+        self.transparent: np.ndarray = TRANSPARENT_LUT[tile_ids]
+
+        # Bumped whenever tiles change; caches derived from the tile layout
+        # (FOV, etc.) key on it so they know when to rebuild.
+        self.revision: int = 0
 
         # Tile coordinates of stairs (tx, ty)
         self.up_stairs: Tuple[int, int] | None = up_stairs
         self.down_stairs: Tuple[int, int] | None = down_stairs
 
-        # Non-player entities on this map (enemies, props, etc.)
-        self.entities: list[Entity] = entities if entities is not None else []
+        # Non-player entities on this map (enemies, props, etc.).
+        # Add / remove them through add_entity / remove_entity so the
+        # entity store's component arrays and the spatial index stay in
+        # sync. Iterating self.entities yields the entity objects.
+        self.spatial: SpatialGrid = SpatialGrid()
+        self.entities: EntityStore = EntityStore(self.spatial)
+        for entity in entities or []:
+            self.add_entity(entity)
+        # Entities with ids 1..spawn_count came from floor generation and
+        # can be regenerated from the run seed (see world.floor_snapshot).
+        self.spawn_count: int = 0
 
         # High-level room structures (with tags like "start", "lair", "treasure", "event")
         self.rooms: list[RectRoom] = rooms if rooms is not None else []
 
+        # Room lookup index: room_ids[y, x] is the index into self.rooms of
+        # the room whose interior holds that tile, or -1 (corridor / wall).
+        self.room_ids: np.ndarray = self._build_room_ids()
+        # id(room) -> index into self.rooms, for room_tiles()
+        self._room_index: Dict[int, int] = {id(room): i for i, room in enumerate(self.rooms)}
+        # Walkable tiles per room index / outside rooms, rebuilt lazily
+        # when the map revision changes.
+        self._room_tiles: List[List[Tuple[int, int]]] = []
+        self._corridor_tiles: List[Tuple[int, int]] = []
+        self._room_tiles_revision: int = -1
+
+        # Pathing: flow fields keyed by goal tile, dropped on revision change
+        self._flow_fields: "OrderedDict[Tuple[int, int], FlowField]" = OrderedDict()
+        self._flow_fields_revision: int = self.revision
+        # A* paths for per-enemy goals (search spots, patrol points)
+        self.paths: PathService = PathService(self)
+        # Coarse room/corridor graph for long trips, rebuilt lazily
+        self._room_graph: RoomGraph | None = None
+        self._room_graph_revision: int = -1
+
         # FOV / exploration state
-        self.visible: Set[Tuple[int, int]] = set()
-        self.explored: Set[Tuple[int, int]] = set()
+        self.fov_algorithm: str = DEFAULT_FOV_ALGORITHM
+        self._transparent_rows: List[List[bool]] | None = None
+        # What the current visible/explored state was computed for:
+        # (tx, ty, radius, algorithm, revision), ("reveal_all", revision) or None
+        self._fov_key: tuple | None = None
+        # Line-of-sight results by packed tile pair (see line_of_sight)
+        self.use_los_cache: bool = True
+        self._los_cache: "OrderedDict[int, bool]" = OrderedDict()
+        self._los_cache_revision: int = self.revision
+        # Symmetric visibility field used for enemy detection (see visibility_from)
+        self._sight_mask: np.ndarray = np.zeros((self.height, self.width), dtype=bool)
+        self._sight_key: tuple | None = None
+
+        # Rendering cache (created lazily on first draw)
+        self.use_render_cache: bool = True
+        self.renderer: MapRenderer | None = None
+
+        # Stored as (height, width) boolean arrays; .visible / .explored
+        # expose them through a set-of-(tx, ty) compatible view.
+        self.visible_mask: np.ndarray = np.zeros((self.height, self.width), dtype=bool)
+        self.explored_mask: np.ndarray = np.zeros((self.height, self.width), dtype=bool)
+        # Bounding rect of the tiles currently in visible_mask (None if empty)
+        self._visible_bounds: _TileRect | None = None
+        # Tile rects whose visible/explored state may have changed since the
+        # renderer last looked (see mark_fog_dirty / take_fog_dirty).
+        self._fog_dirty: List[_TileRect] = []
 
     # ------------------------------------------------------------------
     # Tile helpers
     # ------------------------------------------------------------------
 
+    def get_tile(self, tile_x: int, tile_y: int) -> Tile:
+        """Return the Tile definition at (tile_x, tile_y)."""
+        return TILE_PALETTE[self.tile_ids[tile_y, tile_x]]
+
+    def set_tile(self, tile_x: int, tile_y: int, tile: Tile | int) -> None:
+        """Replace a tile (by Tile or palette id) and update the derived arrays."""
+        tile_id = tile if isinstance(tile, int) else tile_id_for(tile)
+        self.tile_ids[tile_y, tile_x] = tile_id
+        self.walkable[tile_y, tile_x] = WALKABLE_LUT[tile_id]
+        self.transparent[tile_y, tile_x] = TRANSPARENT_LUT[tile_id]
+        self._transparent_rows = None
+        self.revision += 1
+
     def world_to_tile(self, x: float, y: float) -> Tuple[int, int]:
         """Convert pixel coordinates to tile coordinates."""
         tile_x = int(x // TILE_SIZE)
@@ -59,8 +376,7 @@ class GameMap:
         if tile_y >= self.height or tile_x >= self.width:
             return False
 
-        tile = self.tiles[tile_y][tile_x]
-        return tile.walkable
+        return bool(self.walkable[tile_y, tile_x])
 
     def rect_can_move_to(self, rect: pygame.Rect) -> bool:
         """
@@ -83,6 +399,34 @@ class GameMap:
 
         return True
 
+    def rects_can_move_to(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        widths: np.ndarray,
+        heights: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorised rect_can_move_to for many rects at once.
+
+        Rect i is (int(xs[i]), int(ys[i]), widths[i], heights[i]); returns
+        a boolean array, True where all four corners are on walkable tiles.
+        """
+        left = xs.astype(np.int64)
+        top = ys.astype(np.int64)
+        right = left + widths - 1
+        bottom = top + heights - 1
+
+        ok = np.ones(len(left), dtype=bool)
+        for px, py in ((left, top), (right, top), (left, bottom), (right, bottom)):
+            tx = px // TILE_SIZE
+            ty = py // TILE_SIZE
+            inside = (tx >= 0) & (ty >= 0) & (tx < self.width) & (ty < self.height)
+            walk = np.zeros(len(left), dtype=bool)
+            walk[inside] = self.walkable[ty[inside], tx[inside]]
+            ok &= walk
+        return ok
+
     def center_entity_on_tile(
         self,
         tile_x: int,
@@ -102,11 +446,171 @@ class GameMap:
         Return the RectRoom whose interior contains this tile, or None if
         this tile is not inside any room (corridor, junction, etc.).
         """
-        for room in self.rooms:
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return None
+        room_index = int(self.room_ids[tile_y, tile_x])
+        return self.rooms[room_index] if room_index >= 0 else None
+
+    # ------------------------------------------------------------------
+    # Entities
+    # ------------------------------------------------------------------
+
+    def add_entity(self, entity: Entity) -> int:
+        """Place an entity on this map. Returns its stable entity id."""
+        return self.entities.add(entity)
+
+    def remove_entity(self, entity: Entity) -> bool:
+        """
+        Remove an entity (matched by identity) from this map in O(1).
+        Returns False if it wasn't on the map.
+        """
+        return self.entities.remove(entity)
+
+    def has_entity(self, entity: Entity) -> bool:
+        """True if this exact entity object is on the map."""
+        return entity in self.entities
+
+    # Per-type buckets, kept up to date by add_entity / remove_entity.
+    # These are live views: copy with list() before adding / removing
+    # entities while iterating.
+
+    @property
+    def chests(self) -> "ValuesView[Chest]":
+        return self.entities.of_kind(KIND_CHEST)
+
+    @property
+    def merchants(self) -> "ValuesView[Merchant]":
+        return self.entities.of_kind(KIND_MERCHANT)
+
+    def visible_entities(self) -> list[Entity]:
+        """
+        Entities whose centre tile is currently visible, props first and
+        enemies last (so enemies draw on top). One array pass over the
+        entity store instead of a per-entity tile lookup.
+        """
+        store = self.entities
+        if not len(store):
+            return []
+        cx, cy = store.centers()
+        tx = cx // TILE_SIZE
+        ty = cy // TILE_SIZE
+        inside = (tx >= 0) & (ty >= 0) & (tx < self.width) & (ty < self.height)
+        seen = np.zeros(len(store), dtype=bool)
+        seen[inside] = self.visible_mask[ty[inside], tx[inside]]
+        is_enemy = store.kind[: len(store)] == KIND_ENEMY
+        return store.objects(np.flatnonzero(seen & ~is_enemy)) + store.objects(
+            np.flatnonzero(seen & is_enemy)
+        )
+
+    def entities_in_rect(self, rect: pygame.Rect, kind: type | None = None) -> list[Entity]:
+        """Entities overlapping a world-space rect (optionally of one type)."""
+        return self.spatial.query_rect(rect, kind)
+
+    def entities_in_radius(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        kind: type | None = None,
+    ) -> list[Entity]:
+        """Entities whose centre is within ``radius`` pixels of (x, y)."""
+        return self.spatial.query_radius(x, y, radius, kind)
+
+    def nearest_entity(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        kind: type | None = None,
+    ) -> Entity | None:
+        """Entity closest to (x, y) whose centre is within ``radius`` pixels."""
+        nearby = self.spatial.query_radius(x, y, radius, kind)
+        if not nearby:
+            return None
+        return min(
+            nearby,
+            key=lambda e: (e.rect.centerx - x) ** 2 + (e.rect.centery - y) ** 2,
+        )
+
+    # ------------------------------------------------------------------
+    # Room index
+    # ------------------------------------------------------------------
+
+    def _build_room_ids(self) -> np.ndarray:
+        """Rasterise room interiors into a (height, width) int16 room-index grid."""
+        room_ids = np.full((self.height, self.width), -1, dtype=np.int16)
+        # Paint in reverse so that, should interiors ever overlap, the
+        # first room in the list wins (same as the old linear scan).
+        for room_index in range(len(self.rooms) - 1, -1, -1):
+            room = self.rooms[room_index]
             # Interior only: walls are at x1/y1 and x2/y2 boundaries
-            if room.x1 < tile_x < room.x2 and room.y1 < tile_y < room.y2:
-                return room
-        return None
+            room_ids[
+                max(0, room.y1 + 1):max(0, room.y2),
+                max(0, room.x1 + 1):max(0, room.x2),
+            ] = room_index
+        return room_ids
+
+    def _ensure_room_tiles(self) -> None:
+        if self._room_tiles_revision == self.revision:
+            return
+
+        self._room_tiles = []
+        for room_index, room in enumerate(self.rooms):
+            y0 = max(0, room.y1 + 1)
+            x0 = max(0, room.x1 + 1)
+            window = self.room_ids[y0:room.y2, x0:room.x2] == room_index
+            window &= self.walkable[y0:room.y2, x0:room.x2]
+            ys, xs = np.nonzero(window)
+            self._room_tiles.append(list(zip((xs + x0).tolist(), (ys + y0).tolist())))
+
+        ys, xs = np.nonzero(self.walkable & (self.room_ids < 0))
+        self._corridor_tiles = list(zip(xs.tolist(), ys.tolist()))
+        self._room_tiles_revision = self.revision
+
+    def room_tiles(self, room: RectRoom) -> List[Tuple[int, int]]:
+        """Walkable interior tiles (tx, ty) of a room, row-major. Do not mutate."""
+        self._ensure_room_tiles()
+        return self._room_tiles[self._room_index[id(room)]]
+
+    def corridor_tiles(self) -> List[Tuple[int, int]]:
+        """Walkable tiles (tx, ty) outside every room interior, row-major. Do not mutate."""
+        self._ensure_room_tiles()
+        return self._corridor_tiles
+
+    # ------------------------------------------------------------------
+    # Pathing
+    # ------------------------------------------------------------------
+
+    def flow_field_to(self, tile_x: int, tile_y: int) -> FlowField:
+        """
+        Shared distance field towards (tile_x, tile_y).
+
+        The last FLOW_FIELD_CACHE_SIZE goals are kept, so all enemies
+        chasing the player (or searching the same spot) reuse one field
+        until the goal tile changes.
+        """
+        if self._flow_fields_revision != self.revision:
+            self._flow_fields.clear()
+            self._flow_fields_revision = self.revision
+
+        key = (tile_x, tile_y)
+        field = self._flow_fields.get(key)
+        if field is not None:
+            self._flow_fields.move_to_end(key)
+            return field
+
+        field = FlowField(self.walkable, tile_x, tile_y)
+        self._flow_fields[key] = field
+        if len(self._flow_fields) > FLOW_FIELD_CACHE_SIZE:
+            self._flow_fields.popitem(last=False)
+        return field
+
+    def room_graph(self) -> RoomGraph:
+        """Region graph of rooms and corridor pieces (see world.room_graph)."""
+        if self._room_graph is None or self._room_graph_revision != self.revision:
+            self._room_graph = RoomGraph(self.walkable, self.room_ids, len(self.rooms))
+            self._room_graph_revision = self.revision
+        return self._room_graph
 
     # ------------------------------------------------------------------
     # FOV helpers
@@ -120,8 +624,7 @@ class GameMap:
         """Return True if this tile blocks line of sight."""
         if not self.in_bounds(tile_x, tile_y):
             return True
-        tile = self.tiles[tile_y][tile_x]
-        return tile.blocks_sight
+        return not self.transparent[tile_y, tile_x]
 
     def _bresenham_line(self, x0: int, y0: int, x1: int, y1: int):
         """Yield tile coordinates along a Bresenham line from (x0, y0) to (x1, y1)."""
@@ -140,7 +643,7 @@ class GameMap:
                 err -= dy
                 x0 += sx
             if e2 < dx:
-                err += dy
+                err += dx
                 y0 += sy
 
     def _line_of_sight(self, x0: int, y0: int, x1: int, y1: int) -> bool:
@@ -159,35 +662,210 @@ class GameMap:
                 return False
         return True
 
-    def compute_fov(self, center_tx: int, center_ty: int, radius: int = 8) -> None:
+    def line_of_sight(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """
+        Cached _line_of_sight. Floors don't change after generation, so
+        results for pairs within LOS_CACHE_RANGE_TILES are kept (LRU,
+        LOS_CACHE_MAX_ENTRIES) until the map revision changes.
+        """
+        if (
+            not self.use_los_cache
+            or max(abs(x1 - x0), abs(y1 - y0)) > LOS_CACHE_RANGE_TILES
+            or not (self.in_bounds(x0, y0) and self.in_bounds(x1, y1))
+        ):
+            return self._line_of_sight(x0, y0, x1, y1)
+
+        cache = self._los_cache
+        if self._los_cache_revision != self.revision:
+            cache.clear()
+            self._los_cache_revision = self.revision
+
+        n = self.width * self.height
+        key = (y0 * self.width + x0) * n + (y1 * self.width + x1)
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+
+        result = self._line_of_sight(x0, y0, x1, y1)
+        cache[key] = result
+        if len(cache) > LOS_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        return result
+
+    def transparent_rows(self) -> List[List[bool]]:
+        """
+        Plain-Python copy of ``transparent`` (rows of bools, [y][x]).
+        Scalar lookups on lists are much cheaper than on NumPy arrays, so
+        the FOV engines read from this. Rebuilt lazily after set_tile().
+        """
+        if self._transparent_rows is None:
+            self._transparent_rows = self.transparent.tolist()
+        return self._transparent_rows
+
+    def compute_fov(
+        self,
+        center_tx: int,
+        center_ty: int,
+        radius: int = 8,
+        algorithm: str | None = None,
+    ) -> None:
         """
         Recompute FOV from (center_tx, center_ty).
         Fills self.visible and updates self.explored.
+
+        ``algorithm`` picks an engine from FOV_ALGORITHMS; defaults to
+        self.fov_algorithm.
+
+        The result only depends on (viewer tile, radius, algorithm, map
+        revision), so if those match the last call this is a no-op.
         """
-        self.visible.clear()
+        algorithm = algorithm or self.fov_algorithm
+        key = (center_tx, center_ty, radius, algorithm, self.revision)
+        if key == self._fov_key:
+            return
+        self._fov_key = key
+
+        # Only the previous FOV's bounding rect can hold visible tiles
+        old_bounds = self._visible_bounds
+        if old_bounds is not None:
+            x0, y0, x1, y1 = old_bounds
+            self.visible_mask[y0:y1, x0:x1] = False
+            self.mark_fog_dirty(old_bounds)
+        self._visible_bounds = None
 
         if not self.in_bounds(center_tx, center_ty):
             return
 
-        radius_sq = radius * radius
+        # Collect coordinates in plain lists, then write both masks in one
+        # vectorised step.
+        xs: List[int] = []
+        ys: List[int] = []
 
-        # Always see your own tile
-        self.visible.add((center_tx, center_ty))
-        self.explored.add((center_tx, center_ty))
+        def reveal(x: int, y: int) -> None:
+            xs.append(x)
+            ys.append(y)
 
-        for ty in range(center_ty - radius, center_ty + radius + 1):
-            for tx in range(center_tx - radius, center_tx + radius + 1):
-                if not self.in_bounds(tx, ty):
-                    continue
-                dx = tx - center_tx
-                dy = ty - center_ty
-                if dx * dx + dy * dy > radius_sq:
-                    continue
-                if (tx, ty) == (center_tx, center_ty):
-                    continue
-                if self._line_of_sight(center_tx, center_ty, tx, ty):
-                    self.visible.add((tx, ty))
-                    self.explored.add((tx, ty))
+        FOV_ALGORITHMS[algorithm](self, center_tx, center_ty, radius, reveal)
+        if not xs:
+            return
+        self.visible_mask[ys, xs] = True
+        self.explored_mask[ys, xs] = True
+
+        new_bounds = (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+        self._visible_bounds = new_bounds
+        self.mark_fog_dirty(new_bounds)
+
+    def visibility_from(self, center_tx: int, center_ty: int, radius: int) -> np.ndarray:
+        """
+        (height, width) boolean mask of tiles visible from (center_tx,
+        center_ty) within ``radius``, using symmetric shadowcasting.
+
+        Because the algorithm is symmetric, ``mask[ty, tx]`` also answers
+        "can (tx, ty) see the centre tile?", so one field from the player
+        serves every enemy's detection check. Independent of the player's
+        displayed FOV (radius, algorithm, debug reveal) and cached until
+        the centre, radius or map revision changes. Do not mutate.
+        """
+        key = (center_tx, center_ty, radius, self.revision)
+        if key == self._sight_key:
+            return self._sight_mask
+        self._sight_key = key
+
+        mask = self._sight_mask
+        mask.fill(False)
+        if not self.in_bounds(center_tx, center_ty):
+            return mask
+
+        xs: List[int] = []
+        ys: List[int] = []
+
+        def reveal(x: int, y: int) -> None:
+            xs.append(x)
+            ys.append(y)
+
+        fov_symmetric_shadowcast(self, center_tx, center_ty, radius, reveal)
+        mask[ys, xs] = True
+        return mask
+
+    def reveal_all(self) -> None:
+        """
+        Mark every tile visible and explored (debug full-map reveal).
+        Cached like compute_fov: repeated calls are free until the map
+        changes or a normal FOV is computed in between.
+        """
+        key = ("reveal_all", self.revision)
+        if key == self._fov_key:
+            return
+        self._fov_key = key
+
+        self.visible_mask.fill(True)
+        self.explored_mask.fill(True)
+        self._visible_bounds = (0, 0, self.width, self.height)
+        self.mark_fog_dirty()
+
+    def mark_fog_dirty(self, bounds: _TileRect | None = None) -> None:
+        """
+        Record that visible/explored state may have changed inside
+        ``bounds`` (x0, y0, x1, y1), or anywhere if None. compute_fov and
+        reveal_all do this themselves; call it after writing the masks
+        directly so the renderer picks the change up.
+        """
+        if bounds is None:
+            bounds = (0, 0, self.width, self.height)
+        if bounds == (0, 0, self.width, self.height) or len(self._fog_dirty) >= FOG_DIRTY_MAX_RECTS:
+            self._fog_dirty = [(0, 0, self.width, self.height)]
+        else:
+            self._fog_dirty.append(bounds)
+
+    def take_fog_dirty(self) -> List[_TileRect]:
+        """Return and clear the tile rects recorded by mark_fog_dirty."""
+        dirty = self._fog_dirty
+        self._fog_dirty = []
+        return dirty
+
+    def _visible_written(self, bounds: _TileRect | None) -> None:
+        # Direct writes through the .visible view: grow the tracked bounds
+        if bounds is None or self._visible_bounds is None:
+            self._visible_bounds = (0, 0, self.width, self.height)
+        else:
+            x0, y0, x1, y1 = self._visible_bounds
+            self._visible_bounds = (
+                min(x0, bounds[0]), min(y0, bounds[1]),
+                max(x1, bounds[2]), max(y1, bounds[3]),
+            )
+        self._fov_key = None
+        self.mark_fog_dirty(bounds)
+
+    @property
+    def visible(self) -> "TileMaskView":
+        """Tiles in the current FOV, as a set-like view of (tx, ty)."""
+        return TileMaskView(self.visible_mask, self._visible_written)
+
+    @visible.setter
+    def visible(self, coords: Iterable[Tuple[int, int]]) -> None:
+        self.visible_mask = _mask_from_coords(coords, self.width, self.height)
+        self._visible_bounds = (0, 0, self.width, self.height)
+        self._fov_key = None
+        self.mark_fog_dirty()
+
+    @property
+    def explored(self) -> "TileMaskView":
+        """Tiles ever seen on this map, as a set-like view of (tx, ty)."""
+        return TileMaskView(self.explored_mask, self.mark_fog_dirty)
+
+    @explored.setter
+    def explored(self, coords: Iterable[Tuple[int, int]]) -> None:
+        self.explored_mask = _mask_from_coords(coords, self.width, self.height)
+        self.mark_fog_dirty()
+
+    def is_visible(self, tile_x: int, tile_y: int) -> bool:
+        """Return True if the tile is inside the current FOV."""
+        return self.in_bounds(tile_x, tile_y) and bool(self.visible_mask[tile_y, tile_x])
+
+    def invalidate_fov(self) -> None:
+        """Force the next compute_fov / reveal_all call to recompute."""
+        self._fov_key = None
 
     # ------------------------------------------------------------------
     # Rendering
@@ -206,51 +884,96 @@ class GameMap:
         - Never seen              -> black
         - Explored, not visible   -> darkened
         - Visible now             -> full color
-        """
-        screen_w, screen_h = surface.get_size()
 
+        Normally goes through the cached MapRenderer (pre-rendered chunks
+        with fog composited, LRU-cached). Set ``use_render_cache = False``
+        to fill the tiles under the viewport directly instead.
+        """
         if zoom <= 0:
             zoom = 1.0
 
-        tile_screen_size = int(TILE_SIZE * zoom)
-        if tile_screen_size <= 0:
+        if self.use_render_cache:
+            if self.renderer is None:
+                self.renderer = MapRenderer(self)
+            self.renderer.draw(surface, camera_x, camera_y, zoom)
             return
 
-        for y, row in enumerate(self.tiles):
-            world_y = y * TILE_SIZE
-            sy = int((world_y - camera_y) * zoom)
+        self._draw_tiles_direct(surface, camera_x, camera_y, zoom)
 
-            # Skip row if it's completely off-screen vertically
-            if sy >= screen_h or sy + tile_screen_size <= 0:
-                continue
+    def invalidate_render_cache(self) -> None:
+        """Drop cached tile/fog surfaces (e.g. after the display mode changed)."""
+        if self.renderer is not None:
+            self.renderer.invalidate()
 
-            for x, tile in enumerate(row):
-                world_x = x * TILE_SIZE
-                sx = int((world_x - camera_x) * zoom)
+    def visible_tile_bounds(
+            self,
+            screen_w: int,
+            screen_h: int,
+            camera_x: float,
+            camera_y: float,
+            zoom: float,
+    ) -> Tuple[int, int, int, int]:
+        """
+        Tile rectangle under the viewport, clamped to the map, as
+        (tx0, ty0, tx1, ty1) with exclusive upper bounds. Empty when
+        tx1 <= tx0 or ty1 <= ty0.
+        """
+        tile_px = int(TILE_SIZE * zoom)
+        if tile_px <= 0:
+            return 0, 0, 0, 0
 
-                # Skip tile if it's completely off-screen horizontally
-                if sx >= screen_w or sx + tile_screen_size <= 0:
-                    continue
+        off_x = math.floor(camera_x * zoom)
+        off_y = math.floor(camera_y * zoom)
 
-                coord = (x, y)
-                rect = pygame.Rect(sx, sy, tile_screen_size, tile_screen_size)
+        tx0 = max(0, off_x // tile_px)
+        ty0 = max(0, off_y // tile_px)
+        tx1 = min(self.width, -(-(off_x + screen_w) // tile_px))
+        ty1 = min(self.height, -(-(off_y + screen_h) // tile_px))
+        return tx0, ty0, tx1, ty1
 
-                if coord not in self.explored:
-                    # Completely unseen
-                    pygame.draw.rect(surface, (0, 0, 0), rect)
-                    continue
+    def _draw_tiles_direct(
+            self,
+            surface: pygame.Surface,
+            camera_x: float,
+            camera_y: float,
+            zoom: float,
+    ) -> None:
+        """
+        Uncached path: only touches tiles under the viewport.
+
+        Fogged colors for the visible window are computed in one NumPy pass,
+        then each row is drawn as runs of same-colored tiles, one
+        Surface.fill per run.
+        """
+        screen_w, screen_h = surface.get_size()
 
-                base_color = tile.color
-                if coord in self.visible:
-                    color = base_color
-                else:
-                    # Seen before, but not in current FOV
-                    factor = 0.6  # dim but clearly different from black
-                    color = (
-                        int(base_color[0] * factor),
-                        int(base_color[1] * factor),
-                        int(base_color[2] * factor),
-                    )
+        tile_px = int(TILE_SIZE * zoom)
+        if tile_px <= 0:
+            return
 
-                pygame.draw.rect(surface, color, rect)
+        tx0, ty0, tx1, ty1 = self.visible_tile_bounds(screen_w, screen_h, camera_x, camera_y, zoom)
+        if tx1 <= tx0 or ty1 <= ty0:
+            return
 
+        off_x = math.floor(camera_x * zoom)
+        off_y = math.floor(camera_y * zoom)
+
+        # Never seen -> black, explored -> dimmed, visible -> full color
+        state = self.explored_mask[ty0:ty1, tx0:tx1].astype(np.int8)
+        state += self.visible_mask[ty0:ty1, tx0:tx1]
+        colors = COLOR_LUT[self.tile_ids[ty0:ty1, tx0:tx1]] * FOG_FACTOR_LUT[state][..., None]
+
+        fill = surface.fill
+        left = tx0 * tile_px - off_x
+        sy = ty0 * tile_px - off_y
+        for row in colors.astype(np.uint8).tolist():
+            run_start = 0
+            run_color = row[0]
+            for i in range(1, len(row) + 1):
+                if i < len(row) and row[i] == run_color:
+                    continue
+                fill(run_color, (left + run_start * tile_px, sy, (i - run_start) * tile_px, tile_px))
+                if i < len(row):
+                    run_start = i
+                    run_color = row[i]
+            sy += tile_px
@@ -0,0 +1,206 @@
+# world/map_renderer.py
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+import pygame
+
+from settings import TILE_SIZE
+from world.tiles import COLOR_LUT
+
+if TYPE_CHECKING:
+    from world.game_map import GameMap
+
+
+# Fog-of-war states per tile.
+FOG_UNSEEN = 0
+FOG_EXPLORED = 1
+FOG_VISIBLE = 2
+
+# Brightness multiplier per fog state. Explored-but-not-visible tiles are
+# shown at 60% (matches the old per-tile "factor = 0.6" dimming).
+EXPLORED_DIM_FACTOR = 0.6
+FOG_FACTOR_LUT = np.array([0.0, EXPLORED_DIM_FACTOR, 1.0], dtype=np.float32)
+
+# Chunking: the map is rendered in square blocks of CHUNK_TILES tiles.
+CHUNK_TILES = 16
+
+# Upper bound on pixel memory held by cached chunk surfaces (all zoom
+# levels together). Least recently drawn chunks are evicted first.
+CHUNK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_ChunkKey = Tuple[int, int, int]  # (chunk_x, chunk_y, tile_px)
+
+
+class MapRenderer:
+    """
+    Cached, chunked renderer for a GameMap.
+
+    The map is split into CHUNK_TILES x CHUNK_TILES chunks. Each chunk is
+    pre-rendered per zoom level (keyed by on-screen tile size) with its
+    fog of war already composited, in the display's pixel format, and kept
+    in an LRU cache capped at ``max_bytes``.
+
+    - Tile changes (map revision bump) invalidate every chunk.
+    - Fog changes invalidate only the chunks containing tiles whose
+      explored/visible state changed. The map records which tile rects
+      its FOV updates touched (GameMap.take_fog_dirty), and only those
+      rects are diffed against the last frame's state, so fog upkeep
+      follows the FOV size, not the map size.
+    - Each frame only chunks intersecting the viewport are (re)built and
+      blitted, so draw cost follows the screen size, not the map size.
+    """
+
+    def __init__(self, game_map: "GameMap", max_bytes: int = CHUNK_CACHE_MAX_BYTES) -> None:
+        self.game_map = game_map
+        self.max_bytes = max_bytes
+
+        self.chunks_x = -(-game_map.width // CHUNK_TILES)
+        self.chunks_y = -(-game_map.height // CHUNK_TILES)
+
+        # (chunk_x, chunk_y, tile_px) -> (surface, fog_version, byte size)
+        self._cache: "OrderedDict[_ChunkKey, Tuple[pygame.Surface, int, int]]" = OrderedDict()
+        self._cache_bytes: int = 0
+        self._revision: int = game_map.revision
+
+        # Per-tile fog state last seen, and a per-chunk counter bumped when
+        # any tile inside the chunk changes fog state. Nothing is cached
+        # yet, so start from the map's current state and drop whatever
+        # changes it recorded before we existed.
+        self._fog_state = game_map.explored_mask.astype(np.int8)
+        self._fog_state += game_map.visible_mask
+        self._chunk_fog_version = np.zeros((self.chunks_y, self.chunks_x), dtype=np.int64)
+        game_map.take_fog_dirty()
+
+    # ------------------------------------------------------------------
+    # Cache maintenance
+    # ------------------------------------------------------------------
+
+    @property
+    def cache_bytes(self) -> int:
+        """Pixel memory currently held by cached chunk surfaces."""
+        return self._cache_bytes
+
+    def invalidate(self) -> None:
+        """Drop every cached chunk (e.g. after a display mode change)."""
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    def _sync(self) -> None:
+        """Bring the cache in line with the map's tiles and fog state."""
+        game_map = self.game_map
+
+        if self._revision != game_map.revision:
+            self.invalidate()
+            self._revision = game_map.revision
+
+        for x0, y0, x1, y1 in game_map.take_fog_dirty():
+            state = game_map.explored_mask[y0:y1, x0:x1].astype(np.int8)
+            state += game_map.visible_mask[y0:y1, x0:x1]
+
+            previous = self._fog_state[y0:y1, x0:x1]
+            changed = state != previous
+            if not changed.any():
+                continue
+
+            ys, xs = np.nonzero(changed)
+            # np.add.at: several changed tiles may fall in the same chunk
+            np.add.at(
+                self._chunk_fog_version,
+                ((ys + y0) // CHUNK_TILES, (xs + x0) // CHUNK_TILES),
+                1,
+            )
+            previous[...] = state
+
+    def _build_chunk(self, chunk_x: int, chunk_y: int, tile_px: int) -> pygame.Surface:
+        """Render one chunk (tiles + fog) at the given on-screen tile size."""
+        x0 = chunk_x * CHUNK_TILES
+        y0 = chunk_y * CHUNK_TILES
+        x1 = min(x0 + CHUNK_TILES, self.game_map.width)
+        y1 = min(y0 + CHUNK_TILES, self.game_map.height)
+
+        ids = self.game_map.tile_ids[y0:y1, x0:x1]
+        factors = FOG_FACTOR_LUT[self._fog_state[y0:y1, x0:x1]]
+        colors = (COLOR_LUT[ids] * factors[..., None]).astype(np.uint8)  # (h, w, 3)
+
+        # One pixel per tile, then a nearest-neighbour upscale
+        small = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))
+        surf = pygame.transform.scale(small, ((x1 - x0) * tile_px, (y1 - y0) * tile_px))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        return surf
+
+    def _get_chunk(self, chunk_x: int, chunk_y: int, tile_px: int) -> pygame.Surface:
+        """Return a cached chunk surface, rebuilding it if missing or stale."""
+        key = (chunk_x, chunk_y, tile_px)
+        fog_version = int(self._chunk_fog_version[chunk_y, chunk_x])
+
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] == fog_version:
+            self._cache.move_to_end(key)
+            return entry[0]
+
+        if entry is not None:
+            self._cache_bytes -= entry[2]
+
+        surf = self._build_chunk(chunk_x, chunk_y, tile_px)
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        self._cache[key] = (surf, fog_version, size)
+        self._cache.move_to_end(key)
+        self._cache_bytes += size
+        return surf
+
+    def _evict(self, keep: int) -> None:
+        """Evict least recently used chunks until under the memory cap."""
+        # Never evict the `keep` most recent entries (this frame's chunks)
+        while self._cache_bytes > self.max_bytes and len(self._cache) > keep:
+            _, (_, _, size) = self._cache.popitem(last=False)
+            self._cache_bytes -= size
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def draw(
+        self,
+        surface: pygame.Surface,
+        camera_x: float,
+        camera_y: float,
+        zoom: float,
+    ) -> None:
+        tile_px = int(TILE_SIZE * zoom)
+        if tile_px <= 0:
+            return
+
+        self._sync()
+
+        screen_w, screen_h = surface.get_size()
+        chunk_px = CHUNK_TILES * tile_px
+
+        tx0, ty0, tx1, ty1 = self.game_map.visible_tile_bounds(
+            screen_w, screen_h, camera_x, camera_y, zoom
+        )
+        if tx1 <= tx0 or ty1 <= ty0:
+            return
+
+        # Pixel offset of the map's top-left corner on screen
+        off_x = math.floor(camera_x * zoom)
+        off_y = math.floor(camera_y * zoom)
+
+        cx0 = tx0 // CHUNK_TILES
+        cy0 = ty0 // CHUNK_TILES
+        cx1 = (tx1 - 1) // CHUNK_TILES + 1
+        cy1 = (ty1 - 1) // CHUNK_TILES + 1
+
+        blits: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        for cy in range(cy0, cy1):
+            for cx in range(cx0, cx1):
+                chunk = self._get_chunk(cx, cy, tile_px)
+                blits.append((chunk, (cx * chunk_px - off_x, cy * chunk_px - off_y)))
+
+        surface.blits(blits, doreturn=False)
+        self._evict(keep=len(blits))
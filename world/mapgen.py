@@ -1,20 +1,22 @@
 import random
 import math
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from settings import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE
 from world.tiles import (
-    Tile,
-    FLOOR_TILE,
-    WALL_TILE,
-    UP_STAIRS_TILE,
-    DOWN_STAIRS_TILE,
+    TILE_ID_FLOOR,
+    TILE_ID_WALL,
+    TILE_ID_UP_STAIRS,
+    TILE_ID_DOWN_STAIRS,
 )
 
 
 class RectRoom:
     """Axis-aligned rectangular room on the tile grid."""
-    __slots__ = ("x1", "y1", "x2", "y2", "tag")
+    __slots__ = ("x1", "y1", "x2", "y2", "tag", "order")
 
     def __init__(self, x: int, y: int, w: int, h: int, tag: str = "generic") -> None:
         self.x1 = x
@@ -24,6 +26,8 @@ class RectRoom:
         # High-level type for content placement:
         # "start", "lair", "treasure", "event", "generic", "shop"
         self.tag = tag
+        # Placement order on its floor (index into the rooms list)
+        self.order = -1
 
     def center(self) -> tuple[int, int]:
         center_x = (self.x1 + self.x2) // 2
@@ -39,45 +43,155 @@ class RectRoom:
         )
 
 
-def _create_empty_map(width: int, height: int) -> List[List[Tile]]:
-    """Start with solid walls everywhere."""
-    return [[WALL_TILE for _ in range(width)] for _ in range(height)]
+def _create_empty_map(width: int, height: int) -> np.ndarray:
+    """Start with solid walls everywhere (uint8 tile ids, indexed [y, x])."""
+    return np.full((height, width), TILE_ID_WALL, dtype=np.uint8)
+
+
+# Carving is slice assignment on the [y, x] tile array (one C-level fill
+# per room / corridor leg instead of a Python loop per tile).
+
+def _carve_room(tiles: np.ndarray, room: RectRoom) -> None:
+    tiles[room.y1 + 1:room.y2, room.x1 + 1:room.x2] = TILE_ID_FLOOR
+
+
+def _carve_h_tunnel(tiles: np.ndarray, x1: int, x2: int, y: int) -> None:
+    tiles[y, min(x1, x2):max(x1, x2) + 1] = TILE_ID_FLOOR
+
+
+def _carve_v_tunnel(tiles: np.ndarray, y1: int, y2: int, x: int) -> None:
+    tiles[min(y1, y2):max(y1, y2) + 1, x] = TILE_ID_FLOOR
+
+
+# Largest floor size, as a multiple of one screen in each direction.
+MAX_FLOOR_SCALE = 2
 
+# Mega-floors: from this depth on, floors are several screens across and
+# hold hundreds of rooms. Placement attempts scale with area (one per
+# MEGA_TILES_PER_ATTEMPT tiles) instead of the normal 6..22 clamp.
+MEGA_FLOOR_MIN_DEPTH = 10
+MEGA_FLOOR_SCALES = (4, 6, 8)
+MEGA_FLOOR_SCALE_WEIGHTS = (0.4, 0.35, 0.25)
+MEGA_TILES_PER_ATTEMPT = 40
+MEGA_MAX_ROOM_ATTEMPTS = 1500
 
-def _carve_room(tiles: List[List[Tile]], room: RectRoom) -> None:
-    for y in range(room.y1 + 1, room.y2):
-        for x in range(room.x1 + 1, room.x2):
-            tiles[y][x] = FLOOR_TILE
 
+class _RoomGrid:
+    """
+    Uniform bucket grid over placed rooms, so placement stays near-linear
+    in the room count:
 
-def _carve_h_tunnel(tiles: List[List[Tile]], x1: int, x2: int, y: int) -> None:
-    for x in range(min(x1, x2), max(x1, x2) + 1):
-        tiles[y][x] = FLOOR_TILE
+    - overlaps(): a candidate is only tested against rooms sharing one of
+      the buckets its rect covers (same result as testing every room);
+    - nearest(): rooms bucketed by centre, searched in growing rings.
+    """
 
+    def __init__(self, cell_size: int) -> None:
+        self.cell_size = cell_size
+        # bucket -> rooms whose rect (edges included) touches it
+        self._by_area: Dict[Tuple[int, int], List[RectRoom]] = {}
+        # bucket -> rooms whose centre is in it
+        self._by_center: Dict[Tuple[int, int], List[RectRoom]] = {}
+        self._max_ring = 0
+
+    def _span(self, room: RectRoom) -> Tuple[int, int, int, int]:
+        c = self.cell_size
+        return room.x1 // c, room.y1 // c, room.x2 // c, room.y2 // c
+
+    def add(self, room: RectRoom) -> None:
+        bx0, by0, bx1, by1 = self._span(room)
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                self._by_area.setdefault((bx, by), []).append(room)
+        cx, cy = room.center()
+        key = (cx // self.cell_size, cy // self.cell_size)
+        self._by_center.setdefault(key, []).append(room)
+        self._max_ring = max(self._max_ring, abs(key[0]) + 1, abs(key[1]) + 1)
+
+    def overlaps(self, room: RectRoom) -> bool:
+        bx0, by0, bx1, by1 = self._span(room)
+        by_area = self._by_area
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                for other in by_area.get((bx, by), ()):
+                    if room.intersects(other):
+                        return True
+        return False
+
+    def nearest(self, x: int, y: int) -> Optional[RectRoom]:
+        """Placed room whose centre is closest to (x, y) (first placed wins ties)."""
+        c = self.cell_size
+        qx, qy = x // c, y // c
+        best: Optional[RectRoom] = None
+        best_key: Tuple[int, int] = (0, 0)
+        ring = 0
+        while ring <= self._max_ring + max(abs(qx), abs(qy)):
+            # Anything in this ring or beyond is at least (ring - 1) cells away
+            if best is not None and ((ring - 1) * c) ** 2 > best_key[0]:
+                break
+            for bx in range(qx - ring, qx + ring + 1):
+                for by in range(qy - ring, qy + ring + 1):
+                    if ring and max(abs(bx - qx), abs(by - qy)) != ring:
+                        continue
+                    for other in self._by_center.get((bx, by), ()):
+                        ox, oy = other.center()
+                        key = ((ox - x) ** 2 + (oy - y) ** 2, other.order)
+                        if best is None or key < best_key:
+                            best = other
+                            best_key = key
+            ring += 1
+        return best
+
+
+@dataclass(slots=True)
+class FloorLayout:
+    """
+    Output of generate_floor.
+
+    - tiles: (height, width) uint8 array of palette ids from world.tiles
+      (TILE_ID_*), indexed [y, x]; pass it straight to GameMap
+    - up_stairs / down_stairs: stair tiles as (tx, ty)
+    - rooms: carved rooms, tagged ("start", "lair", ...); rooms[0] holds
+      the up stairs and rooms[-1] the down stairs
+    """
+    tiles: np.ndarray
+    up_stairs: Tuple[int, int]
+    down_stairs: Tuple[int, int]
+    rooms: List[RectRoom]
 
-def _carve_v_tunnel(tiles: List[List[Tile]], y1: int, y2: int, x: int) -> None:
-    for y in range(min(y1, y2), max(y1, y2) + 1):
-        tiles[y][x] = FLOOR_TILE
+    @property
+    def width(self) -> int:
+        return int(self.tiles.shape[1])
 
+    @property
+    def height(self) -> int:
+        return int(self.tiles.shape[0])
 
-# world/mapgen.py
 
 def generate_floor(
     floor_index: int,
-) -> Tuple[List[List[Tile]], int, int, int, int, List[RectRoom]]:
+    rng: Optional[random.Random] = None,
+) -> FloorLayout:
     """
     Generate a basic dungeon-style floor:
     - Random rectangular rooms
     - Connected by corridors
 
-    Returns:
-        tiles, up_stairs_tx, up_stairs_ty, down_stairs_tx, down_stairs_ty, rooms
+    Returns a FloorLayout (tile array, stair tiles, rooms).
 
     Floor size and room count now depend on depth:
     - Early floors: mostly around 1× screen size.
     - Mid floors: mix of 1×, 1.5×, and 2×.
     - Deep floors: mostly 1.5×–2×.
+    - Mega-floors (MEGA_FLOOR_MIN_DEPTH and deeper): 4×–8×, with
+      hundreds of rooms. Each new room is joined to the nearest room
+      placed so far (instead of the previous one), so corridors stay
+      local and carving scales with the room count, not the map size.
+
+    ``rng`` drives every roll (the global ``random`` module if omitted),
+    so the same seeded generator reproduces the same floor.
     """
+    rng = rng or random
 
     # --- Decide overall map dimensions in tiles, based on depth ---
     base_tiles_x = WINDOW_WIDTH // TILE_SIZE
@@ -92,19 +206,25 @@ def generate_floor(
         # Mixed: normal, mid, and big floors
         scales = [1.0, 1.5, 2.0]
         weights = [0.4, 0.4, 0.2]
-    else:
+    elif floor_index < MEGA_FLOOR_MIN_DEPTH:
         # Deep floors: almost always larger than one screen
         scales = [1.5, 2.0]
         weights = [0.5, 0.5]
+    else:
+        scales = list(MEGA_FLOOR_SCALES)
+        weights = list(MEGA_FLOOR_SCALE_WEIGHTS)
 
-    scale = random.choices(scales, weights=weights, k=1)[0]
+    mega = floor_index >= MEGA_FLOOR_MIN_DEPTH
+    max_scale = max(MEGA_FLOOR_SCALES) if mega else MAX_FLOOR_SCALE
+
+    scale = rng.choices(scales, weights=weights, k=1)[0]
 
     tiles_x = int(base_tiles_x * scale)
     tiles_y = int(base_tiles_y * scale)
 
     # Safety clamp so we don't go insane in either direction
-    tiles_x = max(base_tiles_x, min(tiles_x, base_tiles_x * 2))
-    tiles_y = max(base_tiles_y, min(tiles_y, base_tiles_y * 2))
+    tiles_x = max(base_tiles_x, min(tiles_x, base_tiles_x * max_scale))
+    tiles_y = max(base_tiles_y, min(tiles_y, base_tiles_y * max_scale))
 
     tiles = _create_empty_map(tiles_x, tiles_y)
 
@@ -118,37 +238,42 @@ def generate_floor(
     max_rooms = int(round(base_rooms * density_factor))
     # Clamp so tiny floors still have a few rooms and huge floors don't explode
     max_rooms = max(6, min(max_rooms, 22))
+    if mega:
+        max_rooms = min(floor_area // MEGA_TILES_PER_ATTEMPT, MEGA_MAX_ROOM_ATTEMPTS)
 
     room_min_size = 4
     room_max_size = 9
 
     rooms: List[RectRoom] = []
+    grid = _RoomGrid(room_max_size + 2)
 
     for _ in range(max_rooms):
-        w = random.randint(room_min_size, room_max_size)
-        h = random.randint(room_min_size, room_max_size)
+        w = rng.randint(room_min_size, room_max_size)
+        h = rng.randint(room_min_size, room_max_size)
 
         # Keep at least a 1-tile wall border around the outside
         if w + 2 >= tiles_x or h + 2 >= tiles_y:
             continue
 
-        x = random.randint(1, tiles_x - w - 2)
-        y = random.randint(1, tiles_y - h - 2)
+        x = rng.randint(1, tiles_x - w - 2)
+        y = rng.randint(1, tiles_y - h - 2)
 
         new_room = RectRoom(x, y, w, h)
 
-        if any(new_room.intersects(other) for other in rooms):
+        if grid.overlaps(new_room):
             continue  # discard this room and try another
 
         # Carve the room
         _carve_room(tiles, new_room)
 
         if rooms:
-            # Connect to previous room with a corridor
-            prev_center_x, prev_center_y = rooms[-1].center()
+            # Connect to the previous room (nearest placed room on
+            # mega-floors) with a corridor
             new_center_x, new_center_y = new_room.center()
+            link = grid.nearest(new_center_x, new_center_y) if mega else rooms[-1]
+            prev_center_x, prev_center_y = link.center()
 
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 # Horizontal then vertical
                 _carve_h_tunnel(tiles, prev_center_x, new_center_x, prev_center_y)
                 _carve_v_tunnel(tiles, prev_center_y, new_center_y, new_center_x)
@@ -157,7 +282,9 @@ def generate_floor(
                 _carve_v_tunnel(tiles, prev_center_y, new_center_y, prev_center_x)
                 _carve_h_tunnel(tiles, prev_center_x, new_center_x, new_center_y)
 
+        new_room.order = len(rooms)
         rooms.append(new_room)
+        grid.add(new_room)
 
     # Tag rooms with high-level roles so content can key off them.
     if rooms:
@@ -183,19 +310,19 @@ def generate_floor(
             # 3) Lair room = another non-start, non-treasure room
             lair_candidates = [r for r in non_start if r is not treasure_room]
             if lair_candidates:
-                lair_room = random.choice(lair_candidates)
+                lair_room = rng.choice(lair_candidates)
                 lair_room.tag = "lair"
 
             # 4) Event room = some remaining generic room if any
             event_candidates = [r for r in rooms if r.tag == "generic"]
             if event_candidates:
-                event_room = random.choice(event_candidates)
+                event_room = rng.choice(event_candidates)
                 event_room.tag = "event"
 
             # 5) Shop room = another remaining generic room, not guaranteed every floor
             shop_candidates = [r for r in rooms if r.tag == "generic"]
-            if shop_candidates and random.random() < 0.7:
-                shop_room = random.choice(shop_candidates)
+            if shop_candidates and rng.random() < 0.7:
+                shop_room = rng.choice(shop_candidates)
                 shop_room.tag = "shop"
 
     # Decide stair tiles (still using first/last room centers)
@@ -208,7 +335,12 @@ def generate_floor(
         up_ty = down_ty = tiles_y // 2
 
     # Place stair tiles (walkable)
-    tiles[up_ty][up_tx] = UP_STAIRS_TILE
-    tiles[down_ty][down_tx] = DOWN_STAIRS_TILE
-
-    return tiles, up_tx, up_ty, down_tx, down_ty, rooms
+    tiles[up_ty, up_tx] = TILE_ID_UP_STAIRS
+    tiles[down_ty, down_tx] = TILE_ID_DOWN_STAIRS
+
+    return FloorLayout(
+        tiles=tiles,
+        up_stairs=(up_tx, up_ty),
+        down_stairs=(down_tx, down_ty),
+        rooms=rooms,
+    )
@@ -0,0 +1,354 @@
+# world/path_service.py
+
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from world.game_map import GameMap
+
+
+Tile = Tuple[int, int]
+Path = Tuple[Tile, ...]
+
+# Result status for PathService queries
+PATH_FOUND = "found"
+PATH_PENDING = "pending"          # search started, out of budget this frame
+PATH_UNREACHABLE = "unreachable"
+
+# A* node expansions allowed per frame across every request on a map.
+PATH_NODE_BUDGET = 2000
+
+# Finished searches (paths and unreachable results) kept per map.
+PATH_CACHE_SIZE = 256
+
+# A suspended search is dropped once nobody has resumed it for this long
+# (game seconds). Far-tier enemies only think every few frames and the
+# think budget can skip them further, so this is well above a frame.
+PATH_SEARCH_IDLE_SECONDS = 1.0
+
+# Trips longer than this (Chebyshev, in tiles) are planned over the map's
+# room graph and refined with short A* legs instead of one full-grid search.
+HIERARCHICAL_MIN_TILES = 16
+
+# Integer step costs: orthogonal / diagonal (≈ 1 : √2)
+_COST_STRAIGHT = 10
+_COST_DIAGONAL = 14
+
+
+class _Search:
+    """Suspended A* state for one (start, goal) request."""
+
+    __slots__ = ("start", "goal", "open", "g", "came_from", "last_used")
+
+    def __init__(self, start: int, goal: int, h: int, now: float) -> None:
+        self.start = start
+        self.goal = goal
+        # (f, tie-break counter, node, g when pushed)
+        self.open: List[Tuple[int, int, int, int]] = [(h, 0, start, 0)]
+        self.g: Dict[int, int] = {start: 0}
+        self.came_from: Dict[int, int] = {}
+        self.last_used = now
+
+
+class PathService:
+    """
+    A* pathfinding over a GameMap's walkable grid, shared by all enemies.
+
+    - Finished results are cached by (start tile, goal tile) and the whole
+      cache is dropped when the map revision changes.
+    - Every tile on a cached path is indexed too, so an enemy walking that
+      path (or another one joining it) gets its remaining suffix without
+      a new search.
+    - Searches expand at most ``node_budget`` nodes per frame in total.
+      A search that runs out is suspended and resumed on the next
+      request (kept for PATH_SEARCH_IDLE_SECONDS without one); callers
+      see PATH_PENDING meanwhile.
+
+    - Long trips (over HIERARCHICAL_MIN_TILES) are planned as a route over
+      the map's room graph, then stitched together from short A* legs
+      between region entry tiles. The stitched path is cached like any
+      other, so enemies follow it without re-planning every tile.
+
+    Call begin_frame(dt) once per frame before enemies query it.
+
+    (The ``pathfinding`` package isn't used here: its finders can't be
+    suspended mid-search or share results between queries, which is the
+    point of this service.)
+    """
+
+    def __init__(
+        self,
+        game_map: "GameMap",
+        node_budget: int = PATH_NODE_BUDGET,
+        cache_size: int = PATH_CACHE_SIZE,
+    ) -> None:
+        self.game_map = game_map
+        self.node_budget = node_budget
+        self.cache_size = cache_size
+
+        self._clock = 0.0
+        self._budget_left = node_budget
+        self._revision = -1
+        self._width = game_map.width
+        self._walk: List[bool] = []
+
+        # (start, goal) -> path, or None if unreachable (LRU order)
+        self._results: "OrderedDict[Tuple[int, int], Optional[Path]]" = OrderedDict()
+        # (tile, goal) -> (path, index of tile in path)
+        self._suffixes: Dict[Tuple[int, int], Tuple[Path, int]] = {}
+        # (start, goal) -> suspended search
+        self._searches: Dict[Tuple[int, int], _Search] = {}
+
+    # ------------------------------------------------------------------
+    # Frame / cache maintenance
+    # ------------------------------------------------------------------
+
+    def begin_frame(self, dt: float) -> None:
+        """Refill the expansion budget and drop searches nobody has resumed lately."""
+        self._clock += dt
+        self._budget_left = self.node_budget
+        cutoff = self._clock - PATH_SEARCH_IDLE_SECONDS
+        stale = [key for key, s in self._searches.items() if s.last_used < cutoff]
+        for key in stale:
+            del self._searches[key]
+
+    def _sync(self) -> None:
+        if self._revision == self.game_map.revision:
+            return
+        self._revision = self.game_map.revision
+        self._width = self.game_map.width
+        self._walk = self.game_map.walkable.ravel().tolist()
+        self._results.clear()
+        self._suffixes.clear()
+        self._searches.clear()
+
+    def _store(self, key: Tuple[int, int], path: Optional[Path]) -> None:
+        self._results[key] = path
+        self._results.move_to_end(key)
+        if path is not None:
+            goal = key[1]
+            for i, tile in enumerate(path):
+                self._suffixes[(self._index(tile), goal)] = (path, i)
+
+        while len(self._results) > self.cache_size:
+            (_, old_goal), old_path = self._results.popitem(last=False)
+            if old_path is None:
+                continue
+            for tile in old_path:
+                skey = (self._index(tile), old_goal)
+                entry = self._suffixes.get(skey)
+                if entry is not None and entry[0] is old_path:
+                    del self._suffixes[skey]
+
+    def _index(self, tile: Tile) -> int:
+        return tile[1] * self._width + tile[0]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def next_step(
+        self, start: Tile, goal: Tile, search: bool = True
+    ) -> Tuple[str, Optional[Tile]]:
+        """
+        The tile after ``start`` on the path to ``goal`` (both tile coords).
+
+        Returns (status, tile); tile is None unless status is PATH_FOUND,
+        and (PATH_FOUND, None) if ``start`` already is the goal. With
+        ``search=False`` only cached results are returned (anything else
+        reports PATH_PENDING) and no search work is done.
+        """
+        status, path, index = self._lookup(start, goal, search=search)
+        if path is None or index + 1 >= len(path):
+            return status, None
+        return status, path[index + 1]
+
+    def _lookup(
+        self,
+        start: Tile,
+        goal: Tile,
+        hierarchical: bool = True,
+        search: bool = True,
+    ) -> Tuple[str, Optional[Path], int]:
+        self._sync()
+
+        gm = self.game_map
+        if not (gm.in_bounds(*start) and gm.in_bounds(*goal)):
+            return PATH_UNREACHABLE, None, 0
+
+        s = self._index(start)
+        g = self._index(goal)
+        if not self._walk[s] or not self._walk[g]:
+            return PATH_UNREACHABLE, None, 0
+        if s == g:
+            return PATH_FOUND, (start,), 0
+
+        suffix = self._suffixes.get((s, g))
+        if suffix is not None:
+            path, index = suffix
+            owner = (self._index(path[0]), g)
+            if owner in self._results:
+                self._results.move_to_end(owner)
+            return PATH_FOUND, path, index
+
+        key = (s, g)
+        if key in self._results:
+            self._results.move_to_end(key)
+            cached = self._results[key]
+            if cached is None:
+                return PATH_UNREACHABLE, None, 0
+            # Its suffix entry was taken over by a path that has since
+            # been evicted: point it back at this one.
+            self._suffixes[key] = (cached, 0)
+            return PATH_FOUND, cached, 0
+
+        if not search:
+            return PATH_PENDING, None, 0
+
+        if hierarchical and max(abs(goal[0] - start[0]), abs(goal[1] - start[1])) > HIERARCHICAL_MIN_TILES:
+            return self._lookup_long(start, goal, key)
+
+        state = self._searches.get(key)
+        if state is None:
+            state = _Search(s, g, self._heuristic(s, g), self._clock)
+            self._searches[key] = state
+        state.last_used = self._clock
+
+        done, path = self._advance(state)
+        if not done:
+            return PATH_PENDING, None, 0
+
+        del self._searches[key]
+        self._store(key, path)
+        if path is None:
+            return PATH_UNREACHABLE, None, 0
+        return PATH_FOUND, path, 0
+
+    def _lookup_long(self, start: Tile, goal: Tile, key: Tuple[int, int]) -> Tuple[str, Optional[Path], int]:
+        """Room-graph route, refined into a path with one A* leg per region."""
+        chain = self.game_map.room_graph().portal_chain(start, goal)
+        if chain is None:
+            self._store(key, None)
+            return PATH_UNREACHABLE, None, 0
+
+        points = [start] + chain + [goal]
+        tiles: List[Tile] = [start]
+        for a, b in zip(points, points[1:]):
+            # Legs are cached too, so progress survives a PATH_PENDING
+            status, leg, index = self._lookup(a, b, hierarchical=False)
+            if leg is None:
+                if status == PATH_UNREACHABLE:
+                    self._store(key, None)
+                return status, None, 0
+            tiles.extend(leg[index + 1:])
+
+        path = _remove_loops(tiles)
+        self._store(key, path)
+        return PATH_FOUND, path, 0
+
+    # ------------------------------------------------------------------
+    # A*
+    # ------------------------------------------------------------------
+
+    def _heuristic(self, a: int, b: int) -> int:
+        """Octile distance between two flat tile indices."""
+        w = self._width
+        ay, ax = divmod(a, w)
+        by, bx = divmod(b, w)
+        dx = abs(ax - bx)
+        dy = abs(ay - by)
+        return _COST_STRAIGHT * (dx + dy) + (_COST_DIAGONAL - 2 * _COST_STRAIGHT) * min(dx, dy)
+
+    def _advance(self, search: _Search) -> Tuple[bool, Optional[Path]]:
+        """
+        Expand nodes until the goal is reached, the open set empties, or
+        the frame budget runs out. Returns (finished, path or None).
+        """
+        walk = self._walk
+        w = self._width
+        h = len(walk) // w if w else 0
+        goal = search.goal
+        gy, gx = divmod(goal, w)
+        open_heap = search.open
+        g_cost = search.g
+        came_from = search.came_from
+        push = heapq.heappush
+        pop = heapq.heappop
+        counter = len(g_cost)
+
+        while open_heap:
+            if self._budget_left <= 0:
+                return False, None
+
+            _, _, node, pushed_g = pop(open_heap)
+            if pushed_g > g_cost[node]:
+                continue  # stale entry, a cheaper route was found later
+            if node == goal:
+                return True, self._reconstruct(search)
+
+            self._budget_left -= 1
+            y, x = divmod(node, w)
+            base = g_cost[node]
+
+            left = x > 0 and walk[node - 1]
+            right = x < w - 1 and walk[node + 1]
+            up = y > 0 and walk[node - w]
+            down = y < h - 1 and walk[node + w]
+
+            # (neighbour, step cost, allowed); diagonals can't cut wall corners
+            for nb, step, ok in (
+                (node - 1, _COST_STRAIGHT, left),
+                (node + 1, _COST_STRAIGHT, right),
+                (node - w, _COST_STRAIGHT, up),
+                (node + w, _COST_STRAIGHT, down),
+                (node - w - 1, _COST_DIAGONAL, up and left),
+                (node - w + 1, _COST_DIAGONAL, up and right),
+                (node + w - 1, _COST_DIAGONAL, down and left),
+                (node + w + 1, _COST_DIAGONAL, down and right),
+            ):
+                if not ok or not walk[nb]:
+                    continue
+                ng = base + step
+                old = g_cost.get(nb)
+                if old is not None and ng >= old:
+                    continue
+                g_cost[nb] = ng
+                came_from[nb] = node
+                ny, nx = divmod(nb, w)
+                dx = abs(nx - gx)
+                dy = abs(ny - gy)
+                f = ng + _COST_STRAIGHT * (dx + dy) + (_COST_DIAGONAL - 2 * _COST_STRAIGHT) * min(dx, dy)
+                counter += 1
+                push(open_heap, (f, counter, nb, ng))
+
+        return True, None
+
+    def _reconstruct(self, search: _Search) -> Path:
+        w = self._width
+        node = search.goal
+        came_from = search.came_from
+        nodes = [node]
+        while node != search.start:
+            node = came_from[node]
+            nodes.append(node)
+        nodes.reverse()
+        return tuple((n % w, n // w) for n in nodes)
+
+
+def _remove_loops(tiles: List[Tile]) -> Path:
+    """Cut out any stretch where stitched legs double back over a tile."""
+    result: List[Tile] = []
+    position: Dict[Tile, int] = {}
+    for tile in tiles:
+        seen_at = position.get(tile)
+        if seen_at is not None:
+            for dropped in result[seen_at + 1:]:
+                del position[dropped]
+            del result[seen_at + 1:]
+            continue
+        position[tile] = len(result)
+        result.append(tile)
+    return tuple(result)
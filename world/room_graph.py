@@ -0,0 +1,219 @@
+# world/room_graph.py
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+Tile = Tuple[int, int]
+
+# Region id for walls / anything not walkable.
+NO_REGION = -1
+
+
+def _octile(ax: int, ay: int, bx: int, by: int) -> float:
+    dx = abs(ax - bx)
+    dy = abs(ay - by)
+    return max(dx, dy) + 0.41421356 * min(dx, dy)
+
+
+class RoomGraph:
+    """
+    Coarse navigation graph over a floor's rooms and corridors.
+
+    Regions:
+        - one per room interior (region id == index into game_map.rooms)
+        - one per connected piece of walkable tiles outside every room
+          (corridors), numbered after the rooms
+
+    Two regions are linked when a walkable tile of one sits orthogonally
+    next to a walkable tile of the other; each such pair is a portal.
+    (Diagonal steps are only allowed when both orthogonal neighbours are
+    walkable, so orthogonal adjacency captures reachability exactly.)
+
+    Long trips are planned as a shortest route over regions first;
+    portal_chain() turns that into a few entry tiles, and short local A*
+    legs between them make up the final path (see world.path_service).
+    """
+
+    def __init__(self, walkable: np.ndarray, room_ids: np.ndarray, room_count: int) -> None:
+        self.height, self.width = walkable.shape
+        self.room_count = room_count
+
+        self.region_ids: np.ndarray = _label_regions(walkable, room_ids, room_count)
+        self.region_count: int = int(self.region_ids.max()) + 1 if self.region_ids.size else 0
+
+        # Centre of mass of each region, used for coarse edge costs
+        self.anchors: List[Tile] = _region_anchors(self.region_ids, self.region_count)
+
+        # region -> {neighbour region: [(tile in region, tile in neighbour), ...]}
+        self.portals: List[Dict[int, List[Tuple[Tile, Tile]]]] = _find_portals(
+            self.region_ids, self.region_count
+        )
+
+        # (start region, goal region) -> region route (both included) or None
+        self._routes: Dict[Tuple[int, int], Optional[List[int]]] = {}
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def region_at(self, tx: int, ty: int) -> int:
+        """Region id of a tile, or NO_REGION for walls / out of bounds."""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return int(self.region_ids[ty, tx])
+        return NO_REGION
+
+    def route(self, start_region: int, goal_region: int) -> Optional[List[int]]:
+        """Cheapest region sequence from start to goal (inclusive), or None."""
+        key = (start_region, goal_region)
+        if key not in self._routes:
+            self._routes[key] = self._search(start_region, goal_region)
+        return self._routes[key]
+
+    def portal_chain(self, start: Tile, goal: Tile) -> Optional[List[Tile]]:
+        """
+        Entry tiles of each region along the route from ``start`` to
+        ``goal`` (excluding both ends), or None if the goal can't be
+        reached. Empty when both are in the same region.
+
+        Each portal is the one closest to the previous point, so the
+        legs between consecutive points stay short.
+        """
+        start_region = self.region_at(*start)
+        goal_region = self.region_at(*goal)
+        if start_region == NO_REGION or goal_region == NO_REGION:
+            return None
+
+        route = self.route(start_region, goal_region)
+        if route is None:
+            return None
+
+        chain: List[Tile] = []
+        px, py = start
+        for region, next_region in zip(route, route[1:]):
+            best: Optional[Tile] = None
+            best_cost = 0.0
+            for (ax, ay), entry in self.portals[region][next_region]:
+                cost = _octile(px, py, ax, ay)
+                if best is None or cost < best_cost:
+                    best = entry
+                    best_cost = cost
+            chain.append(best)
+            px, py = best
+        return chain
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _search(self, start_region: int, goal_region: int) -> Optional[List[int]]:
+        """Dijkstra over regions, edge cost = anchor-to-anchor octile distance."""
+        anchors = self.anchors
+        dist: Dict[int, float] = {start_region: 0.0}
+        came_from: Dict[int, int] = {}
+        heap: List[Tuple[float, int]] = [(0.0, start_region)]
+
+        while heap:
+            d, region = heapq.heappop(heap)
+            if region == goal_region:
+                route = [region]
+                while region != start_region:
+                    region = came_from[region]
+                    route.append(region)
+                route.reverse()
+                return route
+            if d > dist[region]:
+                continue
+            ax, ay = anchors[region]
+            for neighbour in self.portals[region]:
+                bx, by = anchors[neighbour]
+                nd = d + _octile(ax, ay, bx, by)
+                if nd < dist.get(neighbour, float("inf")):
+                    dist[neighbour] = nd
+                    came_from[neighbour] = region
+                    heapq.heappush(heap, (nd, neighbour))
+
+        return None
+
+
+def _label_regions(walkable: np.ndarray, room_ids: np.ndarray, room_count: int) -> np.ndarray:
+    """Room interiors keep their room index; corridor pieces get fresh ids."""
+    height, width = walkable.shape
+    regions = np.where(walkable & (room_ids >= 0), room_ids, NO_REGION).astype(np.int32)
+
+    corridor = (walkable & (room_ids < 0)).ravel().tolist()
+    flat = regions.ravel().tolist()
+    next_id = room_count
+
+    for start, is_corridor in enumerate(corridor):
+        if not is_corridor or flat[start] != NO_REGION:
+            continue
+        # Flood one connected corridor piece (4-connected)
+        flat[start] = next_id
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            y, x = divmod(i, width)
+            for j, ok in (
+                (i - 1, x > 0),
+                (i + 1, x < width - 1),
+                (i - width, y > 0),
+                (i + width, y < height - 1),
+            ):
+                if ok and corridor[j] and flat[j] == NO_REGION:
+                    flat[j] = next_id
+                    queue.append(j)
+        next_id += 1
+
+    return np.array(flat, dtype=np.int32).reshape(height, width)
+
+
+def _region_anchors(region_ids: np.ndarray, region_count: int) -> List[Tile]:
+    """Walkable tile nearest each region's centre of mass."""
+    anchors: List[Tile] = [(0, 0)] * region_count
+    ys, xs = np.nonzero(region_ids >= 0)
+    if not len(ys):
+        return anchors
+    labels = region_ids[ys, xs]
+
+    # Per-region centroids in one pass
+    counts = np.bincount(labels, minlength=region_count)
+    safe = np.maximum(counts, 1)
+    cx = np.bincount(labels, weights=xs, minlength=region_count) / safe
+    cy = np.bincount(labels, weights=ys, minlength=region_count) / safe
+
+    # Closest tile per region: sort by (region, distance) and take the
+    # first tile of each region (stable, so ties keep row-major order).
+    dist = (xs - cx[labels]) ** 2 + (ys - cy[labels]) ** 2
+    order = np.lexsort((dist, labels))
+    regions, first = np.unique(labels[order], return_index=True)
+    picked = order[first]
+    # Regions with no tiles (room interior entirely wall, shouldn't
+    # happen) keep (0, 0).
+    for region, x, y in zip(regions.tolist(), xs[picked].tolist(), ys[picked].tolist()):
+        anchors[region] = (x, y)
+    return anchors
+
+
+def _find_portals(
+    region_ids: np.ndarray, region_count: int
+) -> List[Dict[int, List[Tuple[Tile, Tile]]]]:
+    """Orthogonally adjacent tile pairs that sit in different regions."""
+    portals: List[Dict[int, List[Tuple[Tile, Tile]]]] = [{} for _ in range(region_count)]
+
+    def collect(a: np.ndarray, b: np.ndarray, dx: int, dy: int) -> None:
+        ys, xs = np.nonzero((a >= 0) & (b >= 0) & (a != b))
+        for y, x, ra, rb in zip(ys.tolist(), xs.tolist(), a[ys, xs].tolist(), b[ys, xs].tolist()):
+            ta = (x, y)
+            tb = (x + dx, y + dy)
+            portals[ra].setdefault(rb, []).append((ta, tb))
+            portals[rb].setdefault(ra, []).append((tb, ta))
+
+    collect(region_ids[:, :-1], region_ids[:, 1:], 1, 0)
+    collect(region_ids[:-1, :], region_ids[1:, :], 0, 1)
+    return portals
@@ -0,0 +1,158 @@
+# world/spatial.py
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+import pygame
+
+from settings import TILE_SIZE
+
+if TYPE_CHECKING:
+    from world.entities import Entity
+
+
+# Side length of one grid cell in world pixels (2×2 tiles).
+SPATIAL_CELL_SIZE = TILE_SIZE * 2
+
+_Cell = Tuple[int, int]
+
+
+class SpatialGrid:
+    """
+    Uniform-grid spatial hash for map entities.
+
+    Each entity is bucketed by the cell containing its centre, so it lives
+    in exactly one cell. Queries look at the cells overlapping the query
+    area, grown by the largest entity half-size seen so far, then filter
+    precisely.
+
+    Owned by the map's EntityStore, which keeps it current: Entity.move_to /
+    move_by report to the store, and the store calls update().
+    """
+
+    def __init__(self, cell_size: int = SPATIAL_CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self._cells: Dict[_Cell, List["Entity"]] = {}
+        # id(entity) -> cell it's currently stored in
+        self._entity_cells: Dict[int, _Cell] = {}
+        self._max_half_w = 0
+        self._max_half_h = 0
+
+    def __len__(self) -> int:
+        return len(self._entity_cells)
+
+    def __contains__(self, entity: object) -> bool:
+        return id(entity) in self._entity_cells
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _cell_of(self, entity: "Entity") -> _Cell:
+        size = self.cell_size
+        return (
+            int(entity.x + entity.width / 2) // size,
+            int(entity.y + entity.height / 2) // size,
+        )
+
+    def insert(self, entity: "Entity") -> None:
+        if id(entity) in self._entity_cells:
+            self.update(entity)
+            return
+        cell = self._cell_of(entity)
+        self._cells.setdefault(cell, []).append(entity)
+        self._entity_cells[id(entity)] = cell
+        self._max_half_w = max(self._max_half_w, (entity.width + 1) // 2)
+        self._max_half_h = max(self._max_half_h, (entity.height + 1) // 2)
+
+    def remove(self, entity: "Entity") -> None:
+        cell = self._entity_cells.pop(id(entity), None)
+        if cell is None:
+            return
+        self._remove_from_cell(entity, cell)
+
+    def update(self, entity: "Entity") -> None:
+        """Re-bucket an entity after it moved (no-op if it stayed in its cell)."""
+        old_cell = self._entity_cells.get(id(entity))
+        if old_cell is None:
+            return
+        new_cell = self._cell_of(entity)
+        if new_cell == old_cell:
+            return
+        self._remove_from_cell(entity, old_cell)
+        self._cells.setdefault(new_cell, []).append(entity)
+        self._entity_cells[id(entity)] = new_cell
+
+    def _remove_from_cell(self, entity: "Entity", cell: _Cell) -> None:
+        bucket = self._cells[cell]
+        for i, other in enumerate(bucket):
+            if other is entity:
+                # Order inside a cell doesn't matter: swap-remove
+                bucket[i] = bucket[-1]
+                bucket.pop()
+                break
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._entity_cells.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _candidates(self, left: float, top: float, right: float, bottom: float) -> List["Entity"]:
+        """Entities whose centre cell overlaps the given world-space box."""
+        size = self.cell_size
+        cx0 = int(left - self._max_half_w) // size
+        cy0 = int(top - self._max_half_h) // size
+        cx1 = int(right + self._max_half_w) // size
+        cy1 = int(bottom + self._max_half_h) // size
+
+        cells = self._cells
+        found: List["Entity"] = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def query_rect(
+        self,
+        rect: pygame.Rect,
+        kind: Optional[Type["Entity"]] = None,
+    ) -> List["Entity"]:
+        """Entities whose rect overlaps ``rect`` (optionally only instances of ``kind``)."""
+        result: List["Entity"] = []
+        for entity in self._candidates(rect.left, rect.top, rect.right, rect.bottom):
+            if kind is not None and not isinstance(entity, kind):
+                continue
+            if rect.colliderect(entity.rect):
+                result.append(entity)
+        return result
+
+    def query_radius(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        kind: Optional[Type["Entity"]] = None,
+    ) -> List["Entity"]:
+        """
+        Entities whose rect centre lies within ``radius`` pixels of (x, y)
+        (optionally only instances of ``kind``).
+        """
+        radius_sq = radius * radius
+        result: List["Entity"] = []
+        for entity in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            if kind is not None and not isinstance(entity, kind):
+                continue
+            ex, ey = entity.rect.center
+            dx = ex - x
+            dy = ey - y
+            if dx * dx + dy * dy <= radius_sq:
+                result.append(entity)
+        return result
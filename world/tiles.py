@@ -1,7 +1,9 @@
 # world/tiles.py
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -43,3 +45,42 @@ DOWN_STAIRS_TILE = Tile(
     blocks_sight=False,
     color=DOWN_STAIRS_COLOR,
 )
+
+
+# ----------------------------------------------------------------------
+# Compact (NumPy) storage
+# ----------------------------------------------------------------------
+#
+# Maps store one uint8 tile id per cell. The id indexes TILE_PALETTE, and
+# the lookup tables below turn a whole id array into derived per-tile
+# arrays in one vectorised step (e.g. WALKABLE_LUT[tile_ids]).
+
+TILE_ID_WALL = 0
+TILE_ID_FLOOR = 1
+TILE_ID_UP_STAIRS = 2
+TILE_ID_DOWN_STAIRS = 3
+
+TILE_PALETTE: Tuple[Tile, ...] = (
+    WALL_TILE,
+    FLOOR_TILE,
+    UP_STAIRS_TILE,
+    DOWN_STAIRS_TILE,
+)
+
+WALKABLE_LUT = np.array([t.walkable for t in TILE_PALETTE], dtype=bool)
+TRANSPARENT_LUT = np.array([not t.blocks_sight for t in TILE_PALETTE], dtype=bool)
+COLOR_LUT = np.array([t.color for t in TILE_PALETTE], dtype=np.uint8)
+
+
+def tile_id_for(tile: Tile) -> int:
+    """Return the palette id of a Tile (ValueError if it isn't in the palette)."""
+    return TILE_PALETTE.index(tile)
+
+
+def tiles_to_ids(tiles: List[List[Tile]]) -> np.ndarray:
+    """Convert a legacy List[List[Tile]] grid into a (height, width) uint8 id array."""
+    lookup = {tile: idx for idx, tile in enumerate(TILE_PALETTE)}
+    return np.array(
+        [[lookup[tile] for tile in row] for row in tiles],
+        dtype=np.uint8,
+    ).reshape(len(tiles), len(tiles[0]) if tiles else 0)